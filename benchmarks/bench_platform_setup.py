@@ -0,0 +1,128 @@
+"""Measure sensor and binary sensor platform setup for large accounts.
+
+Run with ``python benchmarks/bench_platform_setup.py`` in an environment
+where Home Assistant is installed.
+
+For 10, 100 and 1000 stations the benchmark sets up every entity the two
+platforms create after the first refresh in two ways:
+
+* ``eager``: the previous setup, building every entity in one pass and
+  adding them with ``update_before_add=True``, so each entity's update is
+  awaited before it is added. The coordinator refresh that update requests
+  is stubbed to a single loop iteration, leaving out the network round trip
+  the real setup paid for, so the eager numbers are a lower bound.
+* ``chunked``: the current setup, building and adding the entities in
+  chunks without an update.
+
+It reports the entity count, the total setup time and the longest stretch
+the event loop was blocked.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.solarcore_energy import binary_sensor, sensor  # noqa: E402
+from custom_components.solarcore_energy.entity import (  # noqa: E402
+    async_add_entities_chunked,
+)
+from custom_components.solarcore_energy.fleet import FleetAggregate  # noqa: E402
+from custom_components.solarcore_energy.table import StationTable  # noqa: E402
+from custom_components.solarcore_energy.util import parse_value  # noqa: E402
+
+STATION_COUNTS = (10, 100, 1000)
+
+
+def make_coordinator(stations: int):
+    table = StationTable(sensor.NUMERIC_KEYS, parse_value, stations)
+    for station_id in range(stations):
+        table.write(
+            station_id,
+            {
+                **{key: "1" for key in sensor.NUMERIC_KEYS},
+                "status": "0",
+                "cstatus": "1",
+                "last_update_time": "2025-09-13T22:34:10",
+            },
+        )
+    async def async_request_refresh():
+        await asyncio.sleep(0)
+
+    return SimpleNamespace(
+        data=table,
+        station_ids=list(range(stations)),
+        station_names={i: f"Station {i}" for i in range(stations)},
+        device_infos={},
+        fleet=FleetAggregate(),
+        async_request_refresh=async_request_refresh,
+    )
+
+
+def all_entities(coordinator):
+    yield from sensor.build_sensor_entities(
+        coordinator, "bench", [d.key for d in sensor.SENSOR_DESCRIPTIONS]
+    )
+    yield from binary_sensor.build_binary_sensor_entities(coordinator)
+
+
+async def setup_eager(coordinator, added) -> None:
+    """Build everything at once and update each entity before adding it."""
+    entities = list(all_entities(coordinator))
+    # What the entity platform does for update_before_add=True
+    await asyncio.gather(*(entity.async_update() for entity in entities))
+    added.extend(entities)
+
+
+async def setup_chunked(coordinator, added) -> None:
+    await async_add_entities_chunked(
+        added.extend,
+        sensor.build_sensor_entities(
+            coordinator, "bench", [d.key for d in sensor.SENSOR_DESCRIPTIONS]
+        ),
+    )
+    await async_add_entities_chunked(
+        added.extend, binary_sensor.build_binary_sensor_entities(coordinator)
+    )
+
+
+async def measure(name: str, setup, stations: int) -> None:
+    coordinator = make_coordinator(stations)
+    added = []
+    longest_block = 0.0
+    last_yield = time.perf_counter()
+
+    async def watchdog():
+        nonlocal longest_block, last_yield
+        while True:
+            now = time.perf_counter()
+            longest_block = max(longest_block, now - last_yield)
+            last_yield = now
+            await asyncio.sleep(0)
+
+    watcher = asyncio.ensure_future(watchdog())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await setup(coordinator, added)
+    elapsed = time.perf_counter() - start
+    watcher.cancel()
+
+    print(
+        f"{name:<8} {stations:>5} stations  {len(added):>6} entities  "
+        f"setup {elapsed * 1000:8.1f} ms  "
+        f"longest loop block {longest_block * 1000:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    for stations in STATION_COUNTS:
+        await measure("eager", setup_eager, stations)
+        await measure("chunked", setup_chunked, stations)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,217 @@
+"""Compare coordinator data layouts for large fleets.
+
+Run with ``python benchmarks/bench_station_table.py [stations] [cycles]``.
+
+Both layouts build each station's values from raw API responses the way the
+coordinator does. The dict layout then keeps that dictionary per station,
+the way the coordinator stored its data before the columnar
+``StationTable``, compares it with the previous snapshot to build the
+station deltas and parses raw strings whenever an entity reads its state.
+The table layout parses once while writing the values in place, takes the
+deltas from the changes the write reports, and entities read floats by
+station index. Each refresh includes one read of every numeric sensor. The benchmark reports
+the memory retained after the run, the peak traced memory during a refresh
+and the time per refresh.
+"""
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PACKAGE_PATH = (
+    Path(__file__).resolve().parents[1] / "custom_components" / "solarcore_energy"
+)
+
+NUMERIC_KEYS = [
+    "power_total",
+    "power1",
+    "power2",
+    "vol1",
+    "vol2",
+    "current1",
+    "current2",
+    "gridseq",
+    "gridvolc",
+    "temp",
+    "total_energy",
+    "today_energy",
+    "forecast_energy",
+    "estimated_savings",
+    "station_capacity",
+    "component_count",
+    "inverter_efficiency",
+    "power_imbalance",
+]
+
+SENSOR_KEYS = frozenset(NUMERIC_KEYS + ["last_update_time"])
+INVERTER_ATTRIBUTE_KEYS = ["status", "cstatus", "time", "smuId"]
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(name, PACKAGE_PATH / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def api_values(rng, station_id):
+    """Return one station's raw inverter record and parsed station info."""
+    power1 = rng.uniform(0, 400)
+    power2 = rng.uniform(0, 400)
+    inverter = {
+        "power1": f"{power1:.1f}W",
+        "power2": f"{power2:.1f}W",
+        "vol1": f"{rng.uniform(30, 40):.1f}V",
+        "vol2": f"{rng.uniform(30, 40):.1f}V",
+        "current1": f"{rng.uniform(0, 10):.2f}A",
+        "current2": f"{rng.uniform(0, 10):.2f}A",
+        "gridseq": str(rng.randint(4990, 5010)),
+        "gridvolc": f"{rng.uniform(225, 240):.1f}V",
+        "temp": f"{rng.uniform(20, 60):.1f}℃",
+        "status": "0",
+        "cstatus": "1",
+        "time": "2025-09-13 22:34:10",
+        "smuId": f"SMU{station_id}",
+    }
+    info = {
+        "total_energy": 1000.0 + station_id,
+        "today_energy": rng.uniform(0, 5),
+        "capacity": "0.8kW",
+        "stationCount": 1,
+    }
+    return inverter, info
+
+
+def make_build_station(parse_value):
+    def build_station(inv, info):
+        """Build a station's values the way ``_async_fetch_station`` does.
+
+        Both layouts are charged for this, the coordinator builds the same
+        dictionary per station before storing it either way.
+        """
+        values = {k: inv[k] for k in NUMERIC_KEYS if k in inv}
+        values.update({k: inv[k] for k in INVERTER_ATTRIBUTE_KEYS if k in inv})
+        power1 = parse_value(inv.get("power1", "0")) or 0.0
+        power2 = parse_value(inv.get("power2", "0")) or 0.0
+        values["power_total"] = power1 + power2
+        for key, value in info.items():
+            if key in SENSOR_KEYS:
+                values[key] = value
+        forecast = {
+            "forecast_energy": info["today_energy"],
+            "estimated_savings": round(info["today_energy"] * 0.2, 2),
+        }
+        values.update((k, v) for k, v in forecast.items() if k in SENSOR_KEYS)
+        capacity = parse_value(info["capacity"]) or 0.0
+        calculated = {
+            "station_capacity": capacity,
+            "inverter_efficiency": round(
+                min(values["power_total"] / (capacity * 1000) * 100, 100), 2
+            ),
+            "power_imbalance": abs(power1 - power2),
+            "last_update_time": datetime.strptime(
+                inv["time"], "%Y-%m-%d %H:%M:%S"
+            ).isoformat(),
+        }
+        values.update((k, v) for k, v in calculated.items() if k in SENSOR_KEYS)
+        return values
+
+    return build_station
+
+
+def make_refresh_dicts(parse_value, station_delta, build_station):
+    def refresh_dicts(previous, fetched):
+        """Rebuild the data the way the dict layout did on every refresh."""
+        data = {}
+        for station_id, (inv, info) in fetched.items():
+            data[station_id] = build_station(inv, info)
+        for station_id, values in data.items():
+            before = previous.get(station_id, {})
+            station_delta(
+                {
+                    key: (before.get(key), value)
+                    for key, value in values.items()
+                    if key not in before or before[key] != value
+                }
+            )
+        for station_id in data:
+            for key in NUMERIC_KEYS:
+                parse_value(data.get(station_id, {}).get(key))
+        return data
+
+    return refresh_dicts
+
+
+def make_refresh_table(station_delta, build_station):
+    def refresh_table(table, fetched):
+        for station_id, (inv, info) in fetched.items():
+            station_delta(table.write(station_id, build_station(inv, info)))
+        for station_id in table:
+            for key in NUMERIC_KEYS:
+                table.value(station_id, key)
+        return table
+
+    return refresh_table
+
+
+def run(name, refresh, make_state, batches):
+    # Timing and memory tracing use separate passes, tracing slows Python down
+    state = make_state()
+    start = time.perf_counter()
+    for fetched in batches:
+        state = refresh(state, fetched)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    state = make_state()
+    peak = 0
+    for fetched in batches:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        state = refresh(state, fetched)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(
+        f"{name:<8} retained {retained / 1024:9.1f} KiB  "
+        f"peak/refresh {peak / 1024:9.1f} KiB  "
+        f"time/refresh {elapsed / len(batches) * 1000:7.2f} ms"
+    )
+    return state
+
+
+def main(stations=1000, cycles=20):
+    rng = random.Random(0)
+    batches = [
+        {station_id: api_values(rng, station_id) for station_id in range(stations)}
+        for _ in range(cycles)
+    ]
+    print(f"{stations} stations, {cycles} refreshes")
+
+    table_module = load("table")
+    parse_value = load("util").parse_value
+    station_delta = load("delta").station_delta
+    build_station = make_build_station(parse_value)
+
+    run(
+        "dict",
+        make_refresh_dicts(parse_value, station_delta, build_station),
+        dict,
+        batches,
+    )
+    run(
+        "table",
+        make_refresh_table(station_delta, build_station),
+        lambda: table_module.StationTable(NUMERIC_KEYS, parse_value, stations),
+        batches,
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -1,10 +1,29 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN
+from homeassistant.helpers.storage import Store
+from .const import (
+    ANOMALY_STORAGE_KEY,
+    ANOMALY_STORAGE_VERSION,
+    BASE_URL,
+    CONF_RATE_LIMIT,
+    DATA_SCHEDULERS,
+    DEFAULT_RATE_LIMIT,
+    DOMAIN,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+    TOKEN_STORAGE_KEY,
+    TOKEN_STORAGE_VERSION,
+)
+from .scheduler import RequestScheduler
+from .sensor import RockcoreDataUpdateCoordinator
+from .services import async_register_services
+from .websocket import async_register_websocket_commands
 
 PLATFORMS = ["sensor", "binary_sensor"]
 
 async def async_setup(hass: HomeAssistant, config: dict):
+    async_register_services(hass)
+    async_register_websocket_commands(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -13,12 +32,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         "data": entry.data,
         "options": entry.options,
     }
+    schedulers = hass.data.setdefault(DATA_SCHEDULERS, {})
+    if BASE_URL not in schedulers:
+        schedulers[BASE_URL] = RequestScheduler(
+            RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST
+        )
+    schedulers[BASE_URL].register(
+        entry.entry_id, entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT)
+    )
+    # Also runs when the first refresh below fails
+    entry.async_on_unload(
+        lambda: schedulers[BASE_URL].unregister(entry.entry_id)
+    )
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    coordinator = RockcoreDataUpdateCoordinator(
+        hass, entry.data, entry.options, schedulers[BASE_URL], entry.entry_id
+    )
+    if coordinator.exporter is not None:
+        coordinator.exporter.async_start()
+        entry.async_on_unload(coordinator.exporter.async_stop)
+    entry.async_on_unload(coordinator.async_stop_profile)
+    await coordinator.async_load_token()
+    await coordinator.async_load_anomalies()
+    entry.async_on_unload(coordinator.async_save_anomalies)
+    # Refresh before forwarding, rejected credentials only start a reauth
+    # flow when raised from here
+    await coordinator.async_config_entry_first_refresh()
+    hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Delete the stored login token and anomaly baselines of a removed entry."""
+    for version, key in (
+        (TOKEN_STORAGE_VERSION, TOKEN_STORAGE_KEY),
+        (ANOMALY_STORAGE_VERSION, ANOMALY_STORAGE_KEY),
+    ):
+        await Store(hass, version, key.format(entry_id=entry.entry_id)).async_remove()
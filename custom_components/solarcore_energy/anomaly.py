@@ -0,0 +1,190 @@
+"""Streaming anomaly detection for string balance and inverter temperature."""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+ANOMALY_ALPHA = 0.01
+ANOMALY_SIGMA = 3.0
+ANOMALY_SUSTAIN = 5
+ANOMALY_WARMUP = 60
+# Readings taken while the outlier persists only nudge the baseline so a
+# slowly failing string is not absorbed into "normal" behaviour
+OUTLIER_WEIGHT = 0.1
+MIN_STRING_POWER = 50.0  # W
+
+STRING_RATIO = "string_ratio"
+TEMPERATURE_RESIDUAL = "temperature_residual"
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+class EwmaStats:
+    """Exponentially weighted mean and variance updated in constant time."""
+
+    __slots__ = ("mean", "var", "count")
+
+    def __init__(self, mean: float = 0.0, var: float = 0.0, count: int = 0) -> None:
+        self.mean = mean
+        self.var = var
+        self.count = count
+
+    def zscore(self, value: float) -> Optional[float]:
+        if self.count < 2 or self.var <= 0:
+            return None
+        return (value - self.mean) / math.sqrt(self.var)
+
+    def update(self, value: float, alpha: float) -> None:
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            incr = alpha * diff
+            self.mean += incr
+            self.var = (1 - alpha) * (self.var + diff * incr)
+        self.count += 1
+
+    def as_list(self) -> list:
+        return [self.mean, self.var, self.count]
+
+
+class AnomalyTracker:
+    """Flag a metric once it stays beyond ``sigma`` for ``sustain`` samples."""
+
+    def __init__(self, stats: Optional[EwmaStats] = None, streak: int = 0) -> None:
+        self.stats = stats or EwmaStats()
+        self.streak = streak
+        self.zscore: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        return self.streak >= ANOMALY_SUSTAIN
+
+    def update(self, value: float) -> None:
+        z = self.stats.zscore(value) if self.stats.count >= ANOMALY_WARMUP else None
+        self.zscore = z
+        outlier = z is not None and abs(z) > ANOMALY_SIGMA
+        self.streak = self.streak + 1 if outlier else 0
+        alpha = ANOMALY_ALPHA * OUTLIER_WEIGHT if outlier else ANOMALY_ALPHA
+        self.stats.update(value, alpha)
+
+    def as_dict(self) -> dict:
+        return {"stats": self.stats.as_list(), "streak": self.streak}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AnomalyTracker":
+        return cls(EwmaStats(*data["stats"]), data.get("streak", 0))
+
+
+class StationAnomalyDetector:
+    """Per-station detectors for string imbalance and temperature drift.
+
+    The string metric is the normalized ratio ``(p1 - p2) / (p1 + p2)``,
+    which does not depend on irradiance. The temperature metric is the
+    residual of an exponentially weighted linear fit of temperature against
+    total power, so a hot inverter at full sun is not reported while the
+    same temperature at low output is.
+    """
+
+    def __init__(self) -> None:
+        self.trackers: Dict[str, AnomalyTracker] = {
+            STRING_RATIO: AnomalyTracker(),
+            TEMPERATURE_RESIDUAL: AnomalyTracker(),
+        }
+        # Exponentially weighted moments of (power kW, temperature)
+        self.fit = [0.0, 0.0, 0.0, 0.0, 0]
+
+    def update(self, values: Mapping[str, Any], parse) -> None:
+        power1 = parse(values.get("power1"))
+        power2 = parse(values.get("power2"))
+        if power1 is not None and power2 is not None:
+            total = power1 + power2
+            if total >= MIN_STRING_POWER:
+                self.trackers[STRING_RATIO].update((power1 - power2) / total)
+
+        temp = parse(values.get("temp"))
+        power = _number(values.get("power_total"))
+        if temp is not None and power is not None:
+            residual = self._temperature_residual(power / 1000, temp)
+            if residual is not None:
+                self.trackers[TEMPERATURE_RESIDUAL].update(residual)
+
+    def _temperature_residual(self, power: float, temp: float) -> Optional[float]:
+        mean_p, mean_t, var_p, cov_pt, count = self.fit
+        residual = None
+        if count:
+            slope = cov_pt / var_p if var_p > 0 else 0.0
+            residual = temp - (mean_t + slope * (power - mean_p))
+            diff_p = power - mean_p
+            diff_t = temp - mean_t
+            mean_p += ANOMALY_ALPHA * diff_p
+            mean_t += ANOMALY_ALPHA * diff_t
+            var_p = (1 - ANOMALY_ALPHA) * (var_p + ANOMALY_ALPHA * diff_p * diff_p)
+            cov_pt = (1 - ANOMALY_ALPHA) * (cov_pt + ANOMALY_ALPHA * diff_p * diff_t)
+        else:
+            mean_p, mean_t = power, temp
+        self.fit = [mean_p, mean_t, var_p, cov_pt, count + 1]
+        return residual
+
+    def as_dict(self) -> dict:
+        return {
+            "fit": list(self.fit),
+            "trackers": {key: t.as_dict() for key, t in self.trackers.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "StationAnomalyDetector":
+        detector = cls()
+        detector.fit = list(data.get("fit", detector.fit))
+        for key, tracker in data.get("trackers", {}).items():
+            if key in detector.trackers:
+                detector.trackers[key] = AnomalyTracker.from_dict(tracker)
+        return detector
+
+
+class AnomalyEngine:
+    """Anomaly detectors for every station of an entry."""
+
+    def __init__(self, parse) -> None:
+        self._parse = parse
+        self.stations: Dict[Any, StationAnomalyDetector] = {}
+        # Restored state keyed by stringified station ID until first seen
+        self._restored: Dict[str, Any] = {}
+
+    def update(self, station_id: Any, values: Mapping[str, Any]) -> None:
+        detector = self.stations.get(station_id)
+        if detector is None:
+            restored = self._restored.pop(str(station_id), None)
+            detector = (
+                StationAnomalyDetector.from_dict(restored)
+                if restored
+                else StationAnomalyDetector()
+            )
+            self.stations[station_id] = detector
+        detector.update(values, self._parse)
+
+    def tracker(self, station_id: Any, metric: str) -> Optional[AnomalyTracker]:
+        detector = self.stations.get(station_id)
+        return detector.trackers[metric] if detector else None
+
+    def retain(self, station_ids: Iterable[Any]) -> None:
+        """Forget the detectors of stations no longer part of the account."""
+        wanted = {str(station_id) for station_id in station_ids}
+        self.stations = {
+            k: v for k, v in self.stations.items() if str(k) in wanted
+        }
+        self._restored = {k: v for k, v in self._restored.items() if k in wanted}
+
+    def as_dict(self) -> dict:
+        # Station IDs become strings once stored as JSON
+        data = dict(self._restored)
+        data.update({str(k): v.as_dict() for k, v in self.stations.items()})
+        return data
+
+    def load(self, data: Mapping[str, Any]) -> None:
+        """Restore detectors saved by ``as_dict``."""
+        self._restored = dict(data)
@@ -0,0 +1,121 @@
+"""Persistence of Rockcore login tokens between restarts."""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+from typing import Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+KEY_ITERATIONS = 200_000
+SALT_SIZE = 16
+# Log in again this long before a token reaches its observed lifetime
+EXPIRY_MARGIN = 300
+# Shortest lifetime learned from a rejection, so renewing still leaves time
+# to use a token
+MIN_LIFETIME = 2 * EXPIRY_MARGIN
+# Growth of the learned lifetime each time a token was renewed unrejected
+LIFETIME_GROWTH = 1.25
+
+
+def login_token(body) -> Optional[str]:
+    """Return the token of a decoded login response.
+
+    Besides 401/403, Rockcore refuses credentials with a 200 response that
+    carries no token, for which None is returned.
+    """
+    data = body.get("data") if isinstance(body, dict) else None
+    token = data.get("token") if isinstance(data, dict) else None
+    return token if isinstance(token, str) and token else None
+
+
+class TokenCipher:
+    """Encrypt tokens with a key derived from the account password.
+
+    The stored file alone is not enough to recover a token, and changing the
+    password makes previously stored tokens unreadable. Deriving the key is
+    deliberately slow, build ciphers in the executor.
+    """
+
+    def __init__(self, password: str, salt: Optional[str] = None) -> None:
+        self.salt = salt or base64.b64encode(os.urandom(SALT_SIZE)).decode()
+        key = hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), base64.b64decode(self.salt), KEY_ITERATIONS
+        )
+        self._fernet = Fernet(base64.urlsafe_b64encode(key))
+
+    def encrypt(self, token: str) -> str:
+        return self._fernet.encrypt(token.encode()).decode()
+
+    def decrypt(self, blob: str) -> Optional[str]:
+        """Return the token, or None if it was encrypted with another key."""
+        try:
+            return self._fernet.decrypt(blob.encode()).decode()
+        except (InvalidToken, ValueError):
+            return None
+
+
+class TokenCache:
+    """Current login token and the token lifetime observed so far.
+
+    The API does not announce when a token expires. Whenever a token that
+    worked before is rejected, the time since it was issued bounds the
+    lifetime from above, and tokens are renewed shortly before reaching it.
+    A rejection can also have other causes, such as a login elsewhere, so
+    each token renewed without being rejected relaxes the bound again.
+    """
+
+    def __init__(self) -> None:
+        self.token: Optional[str] = None
+        self.issued_at = 0.0
+        self.confirmed = False
+        self.lifetime: Optional[float] = None
+
+    def valid(self, now: float) -> bool:
+        if self.token is None:
+            return False
+        if self.lifetime is None:
+            return True
+        return now < self.issued_at + self.lifetime - EXPIRY_MARGIN
+
+    def set(self, token: str, issued_at: float) -> None:
+        if self.token is not None and self.confirmed and self.lifetime is not None:
+            # The previous token outlived the renewal point without a rejection
+            self.lifetime *= LIFETIME_GROWTH
+        self.token = token
+        self.issued_at = issued_at
+        self.confirmed = False
+
+    def confirm(self) -> None:
+        """Mark the current token as accepted by the API."""
+        self.confirmed = self.token is not None
+
+    def reject(self, now: float) -> None:
+        """Drop the current token after the API refused it."""
+        if self.token is not None and self.confirmed:
+            observed = max(now - self.issued_at, MIN_LIFETIME)
+            if self.lifetime is None or observed < self.lifetime:
+                self.lifetime = observed
+        self.token = None
+        self.confirmed = False
+
+    def as_dict(self, cipher: TokenCipher) -> dict:
+        return {
+            "salt": cipher.salt,
+            "token": cipher.encrypt(self.token) if self.token else None,
+            "issued_at": self.issued_at,
+            "confirmed": self.confirmed,
+            "lifetime": self.lifetime,
+        }
+
+    def load(self, data: dict, cipher: TokenCipher) -> None:
+        lifetime = data.get("lifetime")
+        # Lifetimes stored before the minimum existed may be shorter
+        self.lifetime = None if lifetime is None else max(lifetime, MIN_LIFETIME)
+        blob = data.get("token")
+        token = cipher.decrypt(blob) if blob else None
+        if token is not None:
+            self.token = token
+            self.issued_at = data.get("issued_at", 0.0)
+            self.confirmed = data.get("confirmed", False)
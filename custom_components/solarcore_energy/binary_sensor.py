@@ -1,6 +1,8 @@
 """Binary sensor platform for Rockcore Solar integration."""
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
@@ -11,7 +13,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .anomaly import STRING_RATIO, TEMPERATURE_RESIDUAL
 from .const import CONF_SENSORS, DOMAIN
+from .entity import (
+    StationRefreshMixin,
+    async_add_entities_chunked,
+    station_device_info,
+)
 from .util import parse_value, parse_frequency
 
 BINARY_SENSOR_DESCRIPTIONS: list[BinarySensorEntityDescription] = [
@@ -40,8 +48,24 @@ BINARY_SENSOR_DESCRIPTIONS: list[BinarySensorEntityDescription] = [
         translation_key="grid_frequency_ok",
         device_class=BinarySensorDeviceClass.PROBLEM,
     ),
+    BinarySensorEntityDescription(
+        key="string_imbalance_anomaly",
+        translation_key="string_imbalance_anomaly",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+    ),
+    BinarySensorEntityDescription(
+        key="temperature_anomaly",
+        translation_key="temperature_anomaly",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+    ),
 ]
 
+# Anomaly binary sensors and the streaming metric behind each of them
+ANOMALY_METRICS = {
+    "string_imbalance_anomaly": STRING_RATIO,
+    "temperature_anomaly": TEMPERATURE_RESIDUAL,
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -49,15 +73,19 @@ async def async_setup_entry(
     """Set up binary sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    entities = []
+    await async_add_entities_chunked(
+        async_add_entities, build_binary_sensor_entities(coordinator)
+    )
+
+
+def build_binary_sensor_entities(coordinator) -> Iterator:
+    """Yield the binary sensor entities for every station."""
     for station_id in coordinator.station_ids:
         for description in BINARY_SENSOR_DESCRIPTIONS:
-            entities.append(RockcoreBinarySensor(coordinator, station_id, description))
-
-    async_add_entities(entities, True)
+            yield RockcoreBinarySensor(coordinator, station_id, description)
 
 
-class RockcoreBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class RockcoreBinarySensor(StationRefreshMixin, CoordinatorEntity, BinarySensorEntity):
     """Representation of a Rockcore binary sensor."""
 
     def __init__(self, coordinator, station_id: int, description: BinarySensorEntityDescription):
@@ -67,6 +95,7 @@ class RockcoreBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self.entity_description = description
         self._attr_unique_id = f"rockcore_{station_id}_{description.key}"
         self._attr_has_entity_name = True
+        self._attr_device_info = station_device_info(coordinator, station_id)
 
     @property
     def is_on(self) -> bool | None:
@@ -108,18 +137,29 @@ class RockcoreBinarySensor(CoordinatorEntity, BinarySensorEntity):
                 return 49 <= freq_hz <= 51
             return None
 
+        elif self.entity_description.key in ANOMALY_METRICS:
+            tracker = self.coordinator.anomalies.tracker(
+                self.station_id, ANOMALY_METRICS[self.entity_description.key]
+            )
+            if tracker is not None:
+                return tracker.active
+            return None
+
         return None
 
     @property
-    def device_info(self):
-        """Return device info."""
-        station_name = self.coordinator.station_names.get(
-            self.station_id, f"Station {self.station_id}"
-        )
+    def extra_state_attributes(self):
+        """Return the streaming statistics behind anomaly sensors."""
+        metric = ANOMALY_METRICS.get(self.entity_description.key)
+        if metric is None:
+            return None
+        tracker = self.coordinator.anomalies.tracker(self.station_id, metric)
+        if tracker is None:
+            return None
         return {
-            "identifiers": {(DOMAIN, self.station_id)},
-            "name": f"Rockcore {station_name}",
-            "manufacturer": "Rockcore Energy",
-            "model": "Solar Inverter",
-            "sw_version": "1.1.0",
-        }
\ No newline at end of file
+            "zscore": round(tracker.zscore, 2) if tracker.zscore is not None else None,
+            "baseline_mean": round(tracker.stats.mean, 4),
+            "baseline_std": round(tracker.stats.var ** 0.5, 4),
+            "samples": tracker.stats.count,
+            "outlier_streak": tracker.streak,
+        }
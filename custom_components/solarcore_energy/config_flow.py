@@ -1,3 +1,5 @@
+import time
+
 import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
@@ -5,49 +7,85 @@ from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .auth import login_token
 from .const import (
     CONF_SENSORS,
     CONF_UPDATE_INTERVAL,
     CONF_COST_PER_KWH,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_MAX_SIZE,
+    CONF_EXPORT_PATH,
+    CONF_FIRE_EVENTS,
+    CONF_RECORD_TRAFFIC,
+    CONF_RATE_LIMIT,
+    CONF_STATION_INFO_INTERVAL,
+    CONF_STATION_LIST_INTERVAL,
+    DATA_TOKEN_HANDOFF,
     DEFAULT_UPDATE_INTERVAL,
     DEFAULT_COST_PER_KWH,
+    DEFAULT_EXPORT_FORMAT,
+    DEFAULT_EXPORT_MAX_SIZE,
+    DEFAULT_EXPORT_PATH,
+    DEFAULT_FIRE_EVENTS,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_STATION_INFO_INTERVAL,
+    DEFAULT_STATION_LIST_INTERVAL,
     DOMAIN,
     LOGIN_ENDPOINT,
     SENSOR_KEYS,
 )
+from .export import EXPORT_FORMATS
 
 
 class RockcoreConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    _reauth_entry = None
+
+    async def _async_login(self, username, password, errors):
+        """Log in and return the token, or None with ``errors`` filled in."""
+        session = async_get_clientsession(self.hass)
+        payload = {
+            "loginType": "1",
+            "loginName": username,
+            "password": password,
+        }
+        issued_at = time.time()
+        try:
+            async with session.post(LOGIN_ENDPOINT, json=payload) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+        except aiohttp.ClientResponseError as err:
+            if err.status in (401, 403):
+                errors["base"] = "auth"
+            else:
+                errors["base"] = "cannot_connect"
+        except (aiohttp.ClientError, ValueError):
+            errors["base"] = "cannot_connect"
+        else:
+            token = login_token(data)
+            if token is not None:
+                return token, issued_at
+            errors["base"] = "auth"
+        return None
+
+    def _hand_off_token(self, username, login) -> None:
+        """Leave the token for the first refresh so it does not log in again."""
+        self.hass.data.setdefault(DATA_TOKEN_HANDOFF, {})[username] = login
+
     async def async_step_user(self, user_input=None):
         errors = {}
 
         if user_input is not None:
-            session = async_get_clientsession(self.hass)
-            payload = {
-                "loginType": "1",
-                "loginName": user_input[CONF_USERNAME],
-                "password": user_input[CONF_PASSWORD],
-            }
-            try:
-                async with session.post(LOGIN_ENDPOINT, json=payload) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    _ = data["data"]["token"]
-            except aiohttp.ClientResponseError as err:
-                if err.status in (401, 403):
-                    errors["base"] = "auth"
-                else:
-                    errors["base"] = "cannot_connect"
-            except aiohttp.ClientError:
-                errors["base"] = "cannot_connect"
-            except (KeyError, ValueError):
-                errors["base"] = "auth"
-            else:
+            login = await self._async_login(
+                user_input[CONF_USERNAME], user_input[CONF_PASSWORD], errors
+            )
+            if login is not None:
                 await self.async_set_unique_id(user_input[CONF_USERNAME])
                 self._abort_if_unique_id_configured()
 
+                self._hand_off_token(user_input[CONF_USERNAME], login)
                 return self.async_create_entry(
                     title="Rockcore Solar", data=user_input
                 )
@@ -66,6 +104,41 @@ class RockcoreConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+    async def async_step_reauth(self, entry_data):
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        errors = {}
+        username = self._reauth_entry.data[CONF_USERNAME]
+
+        if user_input is not None:
+            login = await self._async_login(
+                username, user_input[CONF_PASSWORD], errors
+            )
+            if login is not None:
+                self._hand_off_token(username, login)
+                self.hass.config_entries.async_update_entry(
+                    self._reauth_entry,
+                    data={
+                        **self._reauth_entry.data,
+                        CONF_PASSWORD: user_input[CONF_PASSWORD],
+                    },
+                )
+                await self.hass.config_entries.async_reload(
+                    self._reauth_entry.entry_id
+                )
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            errors=errors,
+            description_placeholders={"username": username},
+        )
+
     @staticmethod
     def async_get_options_flow(config_entry):
         return RockcoreOptionsFlow(config_entry)
@@ -88,6 +161,18 @@ class RockcoreOptionsFlow(config_entries.OptionsFlow):
                         CONF_UPDATE_INTERVAL,
                         default=options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
                     ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_STATION_INFO_INTERVAL,
+                        default=options.get(
+                            CONF_STATION_INFO_INTERVAL, DEFAULT_STATION_INFO_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_STATION_LIST_INTERVAL,
+                        default=options.get(
+                            CONF_STATION_LIST_INTERVAL, DEFAULT_STATION_LIST_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=1)),
                     vol.Required(
                         CONF_COST_PER_KWH,
                         default=options.get(CONF_COST_PER_KWH, DEFAULT_COST_PER_KWH),
@@ -96,6 +181,30 @@ class RockcoreOptionsFlow(config_entries.OptionsFlow):
                         CONF_SENSORS,
                         default=options.get(CONF_SENSORS, SENSOR_KEYS),
                     ): cv.multi_select(SENSOR_KEYS),
+                    vol.Optional(
+                        CONF_FIRE_EVENTS,
+                        default=options.get(CONF_FIRE_EVENTS, DEFAULT_FIRE_EVENTS),
+                    ): bool,
+                    vol.Required(
+                        CONF_EXPORT_FORMAT,
+                        default=options.get(CONF_EXPORT_FORMAT, DEFAULT_EXPORT_FORMAT),
+                    ): vol.In(EXPORT_FORMATS),
+                    vol.Required(
+                        CONF_EXPORT_PATH,
+                        default=options.get(CONF_EXPORT_PATH, DEFAULT_EXPORT_PATH),
+                    ): str,
+                    vol.Required(
+                        CONF_EXPORT_MAX_SIZE,
+                        default=options.get(CONF_EXPORT_MAX_SIZE, DEFAULT_EXPORT_MAX_SIZE),
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_RECORD_TRAFFIC,
+                        default=options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC),
+                    ): bool,
+                    vol.Required(
+                        CONF_RATE_LIMIT,
+                        default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
                 }
             ),
         )
@@ -10,6 +10,54 @@ DEFAULT_UPDATE_INTERVAL = 30
 CONF_COST_PER_KWH = "cost_per_kwh"
 DEFAULT_COST_PER_KWH = 0.2
 
+CONF_STATION_INFO_INTERVAL = "station_info_interval"
+CONF_STATION_LIST_INTERVAL = "station_list_interval"
+DEFAULT_STATION_INFO_INTERVAL = 300
+DEFAULT_STATION_LIST_INTERVAL = 3600
+
+CONF_FIRE_EVENTS = "fire_events"
+DEFAULT_FIRE_EVENTS = False
+
+CONF_EXPORT_FORMAT = "export_format"
+CONF_EXPORT_PATH = "export_path"
+CONF_EXPORT_MAX_SIZE = "export_max_size"
+DEFAULT_EXPORT_FORMAT = "none"
+DEFAULT_EXPORT_PATH = "solarcore_energy_export"
+DEFAULT_EXPORT_MAX_SIZE = 50  # MB
+
+CONF_RECORD_TRAFFIC = "record_traffic"
+DEFAULT_RECORD_TRAFFIC = False
+TRAFFIC_DIR = "solarcore_energy_traces"
+# Recording stops once a trace file reaches this size
+TRAFFIC_MAX_SIZE = 50  # MB
+
+# Login tokens handed from the config flow to the first refresh, by username
+DATA_TOKEN_HANDOFF = f"{DOMAIN}_token_handoff"
+TOKEN_STORAGE_VERSION = 1
+TOKEN_STORAGE_KEY = DOMAIN + ".{entry_id}.token"
+
+# Anomaly detector baselines kept across restarts
+ANOMALY_STORAGE_VERSION = 1
+ANOMALY_STORAGE_KEY = DOMAIN + ".{entry_id}.anomaly"
+
+# Dispatcher signal and bus event carrying per-station changes after a refresh
+SIGNAL_STATION_DELTAS = f"{DOMAIN}_station_deltas"
+EVENT_STATION_DELTAS = f"{DOMAIN}_station_deltas"
+# Dispatcher signal telling one station's entities, and the fleet entities,
+# that a targeted refresh changed their values
+SIGNAL_STATION_REFRESHED = DOMAIN + "_station_refreshed_{entry_id}_{station_id}"
+
+SERVICE_REFRESH = "refresh"
+ATTR_STATION_ID = "station_id"
+ATTR_DEVICE_ID = "device_id"
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+ATTR_BLOCK_THRESHOLD = "block_threshold"
+ATTR_ENTRY_ID = "entry_id"
+SERVICE_REPLAY = "replay"
+ATTR_TRACE = "trace"
+ATTR_SPEED = "speed"
+
 # Sensor keys used by config and options flow
 SENSOR_KEYS = [
     "power_total",
@@ -39,3 +87,11 @@ STATION_LIST_ENDPOINT = f"{BASE_URL}/station/queryStationInfoList"
 REALTIME_POWER_ENDPOINT = f"{BASE_URL}/inverter/queryInverterRealInfoList"
 STATION_INFO_ENDPOINT = f"{BASE_URL}/station/queryStationInfo"
 
+# Request budget shared by every config entry talking to BASE_URL
+DATA_SCHEDULERS = f"{DOMAIN}_schedulers"
+RATE_LIMIT_PER_SECOND = 2.0
+RATE_LIMIT_BURST = 5
+# Optional cap in requests per second, 0 sizes the budget automatically
+CONF_RATE_LIMIT = "rate_limit"
+DEFAULT_RATE_LIMIT = 0
+
@@ -0,0 +1,31 @@
+"""Per-station change tracking between coordinator refreshes."""
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Tuple
+
+# Keys whose changes are reported as a transition instead of a new value
+STATUS_KEYS = ("status", "cstatus")
+
+# Cumulative keys that also report the increase since the previous refresh
+ENERGY_KEYS = ("today_energy", "total_energy")
+
+
+def station_delta(changes: Mapping[str, Tuple[Any, Any]]) -> Dict[str, Any]:
+    """Format ``{key: (old, new)}`` changes of one station as a delta.
+
+    Status codes are reported as ``{"from": old, "to": new}`` and energy
+    counters carry an additional ``<key>_delta`` entry with the difference
+    to the previous value.
+    """
+    delta: Dict[str, Any] = {}
+    for key, (old, value) in changes.items():
+        if key in STATUS_KEYS:
+            delta[key] = {"from": old, "to": value}
+        elif key in ENERGY_KEYS:
+            delta[key] = value
+            if isinstance(old, (int, float)) and isinstance(value, (int, float)):
+                delta[f"{key}_delta"] = round(value - old, 3)
+        else:
+            delta[key] = value
+    return delta
+
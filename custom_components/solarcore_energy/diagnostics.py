@@ -3,7 +3,7 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import BASE_URL, DATA_SCHEDULERS, DOMAIN
 
 
 async def async_get_config_entry_diagnostics(
@@ -16,9 +16,11 @@ async def async_get_config_entry_diagnostics(
     last_update = None
     errors = None
     stations = None
+    tiers = None
 
     if coordinator:
         stations = coordinator.station_ids
+        tiers = coordinator.tiers.as_dict()
         last_update = getattr(coordinator, "last_update_success_time", None)
         if last_update is not None:
             last_update = last_update.isoformat()
@@ -26,8 +28,12 @@ async def async_get_config_entry_diagnostics(
             err = getattr(coordinator, "last_exception", None)
             errors = str(err) if err else "Unknown error"
 
+    scheduler = hass.data.get(DATA_SCHEDULERS, {}).get(BASE_URL)
+
     return {
         "stations": stations,
         "last_update": last_update,
         "errors": errors,
+        "tiers": tiers,
+        "scheduler": scheduler.as_dict() if scheduler else None,
     }
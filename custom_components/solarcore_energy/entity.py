@@ -0,0 +1,76 @@
+"""Shared helpers for Rockcore Solar entities."""
+from __future__ import annotations
+
+import asyncio
+from itertools import islice
+from typing import Iterable
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_STATION_REFRESHED
+
+ENTITY_CHUNK_SIZE = 250
+DEVICE_SW_VERSION = "1.0.0"
+
+
+def station_device_info(coordinator, station_id) -> DeviceInfo:
+    """Return the device info of a station, built once per station."""
+    info = coordinator.device_infos.get(station_id)
+    if info is None:
+        station_name = coordinator.station_names.get(
+            station_id, f"Station {station_id}"
+        )
+        info = DeviceInfo(
+            identifiers={(DOMAIN, station_id)},
+            name=f"Rockcore {station_name}",
+            manufacturer="Rockcore Energy",
+            model="Solar Inverter",
+            sw_version=DEVICE_SW_VERSION,
+        )
+        coordinator.device_infos[station_id] = info
+    return info
+
+
+def station_refreshed_signal(entry_id, station_id=None) -> str:
+    """Return the signal sent when a station was refreshed on its own.
+
+    Without ``station_id`` the signal reaches the fleet entities of the entry.
+    """
+    return SIGNAL_STATION_REFRESHED.format(
+        entry_id=entry_id, station_id="fleet" if station_id is None else station_id
+    )
+
+
+class StationRefreshMixin:
+    """Write the entity state after a targeted refresh of its station.
+
+    Targeted refreshes only notify the affected entities instead of every
+    coordinator listener. Entities without a ``station_id`` follow the fleet.
+    """
+
+    station_id = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                station_refreshed_signal(self.coordinator.entry_id, self.station_id),
+                self.async_write_ha_state,
+            )
+        )
+
+
+async def async_add_entities_chunked(
+    async_add_entities, entities: Iterable, chunk_size: int = ENTITY_CHUNK_SIZE
+) -> None:
+    """Build and register entities in chunks, yielding to the event loop in between.
+
+    ``entities`` should be a generator so that constructing the entities is
+    split across chunks as well, not only their registration.
+    """
+    entities = iter(entities)
+    while chunk := list(islice(entities, chunk_size)):
+        async_add_entities(chunk)
+        await asyncio.sleep(0)
@@ -0,0 +1,250 @@
+"""Local export of station and inverter snapshots to SQLite or CSV."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_FORMAT_NONE = "none"
+EXPORT_FORMAT_SQLITE = "sqlite"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMATS = [EXPORT_FORMAT_NONE, EXPORT_FORMAT_SQLITE, EXPORT_FORMAT_CSV]
+
+# Both counted in snapshots, one per refresh
+EXPORT_QUEUE_SIZE = 100
+EXPORT_BATCH_SIZE = 10
+
+COLUMNS = ["time", "entry_id", "station_id", "kind", "inverter_index", "payload"]
+
+Row = Tuple[str, Optional[str], str, str, Optional[int], str]
+
+
+def build_rows(
+    entry_id: Optional[str],
+    data: dict,
+    inverter_rows: dict,
+    station_ids: Optional[Iterable[Any]] = None,
+    now: Optional[str] = None,
+) -> List[Row]:
+    """Return export rows for the given stations of a refresh.
+
+    Every station produces one ``station`` row holding its normalized values
+    and one ``inverter`` row per raw inverter record returned by the API.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc).isoformat()
+    rows: List[Row] = []
+    for station_id in data if station_ids is None else station_ids:
+        rows.append(
+            (
+                now,
+                entry_id,
+                str(station_id),
+                "station",
+                None,
+                json.dumps(dict(data[station_id]), default=str),
+            )
+        )
+        for index, inverter in enumerate(inverter_rows.get(station_id, [])):
+            rows.append(
+                (
+                    now,
+                    entry_id,
+                    str(station_id),
+                    "inverter",
+                    index,
+                    json.dumps(inverter, default=str),
+                )
+            )
+    return rows
+
+
+class Snapshot(NamedTuple):
+    """Values of one refresh, taken on the event loop and serialized later.
+
+    ``data`` and ``inverter_rows`` must not change after the snapshot is
+    taken, such as a ``StationTable.copy()`` and a shallow copy of the raw
+    inverter records.
+    """
+
+    time: str
+    entry_id: Optional[str]
+    data: Any
+    inverter_rows: dict
+    station_ids: Optional[List[Any]] = None
+
+    @classmethod
+    def take(cls, entry_id, data, inverter_rows, station_ids=None) -> "Snapshot":
+        return cls(
+            datetime.now(timezone.utc).isoformat(),
+            entry_id,
+            data,
+            inverter_rows,
+            station_ids,
+        )
+
+    def rows(self) -> List[Row]:
+        return build_rows(
+            self.entry_id, self.data, self.inverter_rows, self.station_ids, self.time
+        )
+
+
+class _RotatingWriter:
+    """Base class for writers that rotate the target file by size."""
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        # A write may still be running in the executor while the exporter stops
+        self._lock = threading.RLock()
+
+    def write_rows(self, rows: List[Row]) -> None:
+        with self._lock:
+            if self.max_bytes and os.path.exists(self.path):
+                if os.path.getsize(self.path) >= self.max_bytes:
+                    self._rotate()
+            self._write(rows)
+
+    def write_snapshots(self, snapshots: List[Snapshot]) -> None:
+        """Serialize ``snapshots`` and write them, meant for the executor."""
+        self.write_rows([row for snapshot in snapshots for row in snapshot.rows()])
+
+    def _rotate(self) -> None:
+        self.close()
+        stem, suffix = os.path.splitext(self.path)
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        os.replace(self.path, f"{stem}.{stamp}{suffix}")
+
+    def _write(self, rows: List[Row]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any open file handle."""
+
+
+class SqliteWriter(_RotatingWriter):
+    """Append rows to a ``snapshots`` table in a SQLite database."""
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        super().__init__(path, max_bytes)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "time TEXT, entry_id TEXT, station_id TEXT, kind TEXT, "
+                "inverter_index INTEGER, payload TEXT)"
+            )
+        return self._conn
+
+    def _write(self, rows: List[Row]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CsvWriter(_RotatingWriter):
+    """Append rows to a CSV file with a header line."""
+
+    def _write(self, rows: List[Row]) -> None:
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            if new_file:
+                writer.writerow(COLUMNS)
+            writer.writerows(rows)
+
+
+def create_writer(export_format: str, path: str, max_bytes: int) -> _RotatingWriter:
+    """Return the writer for ``export_format``."""
+    if export_format == EXPORT_FORMAT_SQLITE:
+        return SqliteWriter(path, max_bytes)
+    if export_format == EXPORT_FORMAT_CSV:
+        return CsvWriter(path, max_bytes)
+    raise ValueError(f"Unsupported export format: {export_format}")
+
+
+class SnapshotExporter:
+    """Feed snapshots through a bounded queue to a writer in the executor.
+
+    ``enqueue`` never blocks: when the queue is full the snapshot is dropped
+    and counted. A background task drains the queue and serializes and
+    writes batches of up to ``EXPORT_BATCH_SIZE`` snapshots off the event
+    loop.
+    """
+
+    def __init__(self, hass, writer: _RotatingWriter) -> None:
+        self.hass = hass
+        self.writer = writer
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, snapshot: Snapshot) -> None:
+        try:
+            self._queue.put_nowait(snapshot)
+        except asyncio.QueueFull:
+            if not self.dropped:
+                _LOGGER.warning(
+                    "Export queue full, dropping snapshots for %s",
+                    self.writer.path,
+                )
+            self.dropped += 1
+
+    def async_start(self) -> None:
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"solarcore_energy export {self.writer.path}"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop the background task and flush rows still in the queue."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._async_flush(self._drain())
+        await self.hass.async_add_executor_job(self.writer.close)
+
+    def _drain(self) -> List[Snapshot]:
+        batch: List[Snapshot] = []
+        while not self._queue.empty() and len(batch) < EXPORT_BATCH_SIZE:
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _async_flush(self, batch: List[Snapshot]) -> None:
+        while batch:
+            try:
+                await self.hass.async_add_executor_job(
+                    self.writer.write_snapshots, batch
+                )
+            except (OSError, sqlite3.Error) as err:
+                _LOGGER.error("Writing snapshot export failed: %s", err)
+            batch = self._drain()
+
+    async def _async_run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            batch.extend(self._drain())
+            await self._async_flush(batch)
@@ -0,0 +1,119 @@
+"""Account-level aggregates maintained incrementally across stations."""
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+
+class StationContribution(NamedTuple):
+    """Values a single station adds to the fleet totals."""
+
+    power: float
+    total_energy: float
+    today_energy: float
+    producing: int
+    faulted: int
+    offline: int
+    capacity: float
+    weighted_efficiency: float
+
+
+EMPTY_CONTRIBUTION = StationContribution(0.0, 0.0, 0.0, 0, 0, 0, 0.0, 0.0)
+TODAY_ENERGY_INDEX = StationContribution._fields.index("today_energy")
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return 0.0
+
+
+def station_contribution(values: Mapping[str, Any]) -> StationContribution:
+    """Return the contribution of one station snapshot to the fleet totals.
+
+    A station without any inverter status is counted as offline, a non-zero
+    ``status`` code as faulted and a positive ``power_total`` as producing.
+    Utilization is the ``inverter_efficiency`` weighted by
+    ``station_capacity``; stations that are not producing report no
+    efficiency and count as idle capacity.
+    """
+    power = _number(values.get("power_total"))
+    status = values.get("status")
+    capacity = _number(values.get("station_capacity"))
+    efficiency = _number(values.get("inverter_efficiency"))
+    if capacity <= 0:
+        capacity = 0.0
+
+    return StationContribution(
+        power=power,
+        total_energy=_number(values.get("total_energy")),
+        today_energy=_number(values.get("today_energy")),
+        producing=int(power > 0),
+        faulted=int(status is not None and str(status) != "0"),
+        offline=int(status is None),
+        capacity=capacity,
+        weighted_efficiency=efficiency * capacity,
+    )
+
+
+class FleetAggregate:
+    """Running totals over all stations of an account.
+
+    Each update only replaces the contribution of the station that changed,
+    so the cost of a refresh scales with the number of changed stations
+    rather than the size of the fleet.
+
+    The energy totals are increasing meters, so a removed station keeps its
+    energy in them instead of reading as a meter reset. Its today energy is
+    only dropped at the next daily reset of a remaining station.
+    """
+
+    def __init__(self) -> None:
+        self._stations: Dict[Any, StationContribution] = {}
+        self._totals = list(EMPTY_CONTRIBUTION)
+        self._retired_today = 0.0
+
+    @property
+    def station_ids(self) -> list:
+        return list(self._stations)
+
+    def update(self, station_id: Any, values: Mapping[str, Any]) -> None:
+        """Replace the contribution of ``station_id`` with ``values``."""
+        self._replace(station_id, station_contribution(values))
+
+    def remove(self, station_id: Any) -> None:
+        """Drop a station that is no longer part of the account."""
+        old = self._stations.pop(station_id, None)
+        if old is None:
+            return
+        retired = EMPTY_CONTRIBUTION._replace(
+            total_energy=old.total_energy, today_energy=old.today_energy
+        )
+        for index, (before, after) in enumerate(zip(old, retired)):
+            self._totals[index] += after - before
+        self._retired_today += old.today_energy
+
+    def _replace(self, station_id: Any, new: StationContribution) -> None:
+        old = self._stations.get(station_id, EMPTY_CONTRIBUTION)
+        if self._retired_today and new.today_energy < old.today_energy:
+            # A new day started, removed stations no longer count today
+            self._totals[TODAY_ENERGY_INDEX] -= self._retired_today
+            self._retired_today = 0.0
+        for index, (before, after) in enumerate(zip(old, new)):
+            self._totals[index] += after - before
+        self._stations[station_id] = new
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """Return the current fleet values keyed by sensor key."""
+        totals = StationContribution(*self._totals)
+        utilization = None
+        if totals.capacity > 0:
+            utilization = round(totals.weighted_efficiency / totals.capacity, 2)
+        return {
+            "fleet_power_total": round(totals.power, 3),
+            "fleet_total_energy": round(totals.total_energy, 3),
+            "fleet_today_energy": round(totals.today_energy, 3),
+            "fleet_producing_stations": totals.producing,
+            "fleet_faulted_stations": totals.faulted,
+            "fleet_offline_stations": totals.offline,
+            "fleet_utilization": utilization,
+        }
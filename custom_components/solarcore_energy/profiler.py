@@ -0,0 +1,129 @@
+"""Per-stage profiling of coordinator refresh cycles."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+STAGES = [
+    "network",
+    "json_decode",
+    "parse_value",
+    "energy_guard",
+    "forecast",
+    "derived_sensors",
+    "state_writes",
+]
+
+BLOCK_CHECK_INTERVAL = 0.05
+
+
+def write_profile(path: str, report: Dict[str, object]) -> None:
+    """Write a profile report as indented JSON."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+
+
+class RefreshProfiler:
+    """Collect stage timings for a fixed number of refresh cycles.
+
+    The coordinator only holds a profiler while one is requested, and every
+    instrumentation point checks for it first, so an idle coordinator pays
+    nothing beyond that check.
+    """
+
+    def __init__(
+        self,
+        cycles: int,
+        block_threshold: Optional[float] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.cycles = cycles
+        self.block_threshold = block_threshold
+        self._clock = clock
+        self.current_stage: Optional[str] = None
+        self.results: List[dict] = []
+        self.blocks: List[dict] = []
+        self._cycle: Optional[dict] = None
+        self._cycle_start = 0.0
+        self._monitor: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= self.cycles
+
+    def start_cycle(self) -> None:
+        self._cycle = {stage: 0.0 for stage in STAGES}
+        self._cycle_start = self._clock()
+
+    def record(self, stage: str, elapsed: float) -> None:
+        if self._cycle is not None:
+            self._cycle[stage] = self._cycle.get(stage, 0.0) + elapsed
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        previous, self.current_stage = self.current_stage, stage
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.record(stage, self._clock() - start)
+            self.current_stage = previous
+
+    def end_cycle(self, success: bool = True) -> None:
+        """Close the current cycle, including its state writes."""
+        if self._cycle is None:
+            return
+        cycle = {stage: round(value * 1000, 3) for stage, value in self._cycle.items()}
+        cycle["total"] = round((self._clock() - self._cycle_start) * 1000, 3)
+        cycle["success"] = success
+        self.results.append(cycle)
+        self._cycle = None
+
+    def start_block_monitor(
+        self, create_task: Callable[[Awaitable[None]], asyncio.Task]
+    ) -> None:
+        """Log event loop stalls longer than ``block_threshold`` seconds.
+
+        ``create_task`` schedules the watching coroutine, so the caller decides
+        how the task is tracked.
+        """
+        if self.block_threshold and self._monitor is None:
+            self._monitor = create_task(self._async_watch_loop())
+
+    def stop_block_monitor(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+
+    async def _async_watch_loop(self) -> None:
+        while True:
+            start = self._clock()
+            await asyncio.sleep(BLOCK_CHECK_INTERVAL)
+            lag = self._clock() - start - BLOCK_CHECK_INTERVAL
+            if lag > self.block_threshold:
+                stage = self.current_stage or "outside refresh"
+                _LOGGER.warning(
+                    "Event loop blocked for %.1f ms during %s", lag * 1000, stage
+                )
+                self.blocks.append({"stage": stage, "ms": round(lag * 1000, 3)})
+
+    def report(self) -> Dict[str, object]:
+        """Return per-cycle timings, per-stage averages and detected stalls."""
+        averages = {}
+        if self.results:
+            for key in STAGES + ["total"]:
+                averages[key] = round(
+                    sum(cycle[key] for cycle in self.results) / len(self.results), 3
+                )
+        return {
+            "unit": "ms",
+            "cycles": self.results,
+            "average": averages,
+            "loop_blocks": self.blocks,
+        }
@@ -0,0 +1,178 @@
+"""Process-wide request scheduling shared by all entries of one backend."""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+# Automatic budgets leave this much room above the entries' expected load
+DEMAND_HEADROOM = 1.5
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it.
+
+        The token balance may go negative so that consecutive reservations
+        are spaced ``1 / rate`` seconds apart.
+        """
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+def seconds_until_slot(now: float, interval: float, phase: float) -> float:
+    """Return the delay to the next poll slot of an entry.
+
+    Slots are the instants ``phase + k * interval``. The delay is kept within
+    ``[interval / 2, 3 * interval / 2)`` so an entry drifts back onto its slot
+    without ever polling twice in quick succession.
+    """
+    delay = interval - ((now - phase) % interval)
+    if delay < interval / 2:
+        delay += interval
+    return delay
+
+
+@dataclass
+class EntryStats:
+    """Per-entry fairness counters."""
+
+    requests: int = 0
+    waited: float = 0.0
+    max_wait: float = 0.0
+
+
+class RequestScheduler:
+    """Rate limit and stagger polling of every entry using the same backend.
+
+    All requests go through one token bucket and are granted send times in
+    arrival order. Each registered entry gets an evenly spaced phase within
+    its polling interval so refreshes of several accounts do not line up.
+
+    An entry may configure a request limit; the smallest configured limit
+    applies to the whole backend. Without one the rate follows the expected
+    load reported by the entries with ``set_demand``, never going below
+    ``rate``, so large accounts still fit a refresh into their interval.
+    The burst allows one second of requests at the current rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._min_rate = rate
+        self._min_burst = burst
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._clock = clock
+        self._entries: List[str] = []
+        self._stats: Dict[str, EntryStats] = {}
+        self._limits: Dict[str, float] = {}
+        self._demand: Dict[str, float] = {}
+
+    def register(self, entry_id: str, limit: Optional[float] = None) -> None:
+        """Add an entry, with an optional cap in requests per second."""
+        if entry_id not in self._entries:
+            self._entries.append(entry_id)
+            self._stats[entry_id] = EntryStats()
+        if limit:
+            self._limits[entry_id] = limit
+        self._update_rate()
+
+    def unregister(self, entry_id: str) -> None:
+        if entry_id in self._entries:
+            self._entries.remove(entry_id)
+            self._stats.pop(entry_id, None)
+        self._limits.pop(entry_id, None)
+        self._demand.pop(entry_id, None)
+        self._update_rate()
+
+    def set_demand(self, entry_id: str, requests_per_second: float) -> None:
+        """Report the request rate an entry needs to keep up with its polls."""
+        if entry_id in self._entries:
+            self._demand[entry_id] = requests_per_second
+            self._update_rate()
+
+    def _update_rate(self) -> None:
+        if self._limits:
+            rate = min(self._limits.values())
+        else:
+            rate = max(self._min_rate, sum(self._demand.values()) * DEMAND_HEADROOM)
+        self._bucket.rate = rate
+        self._bucket.capacity = max(self._min_burst, math.ceil(rate))
+
+    @property
+    def entry_ids(self) -> List[str]:
+        return list(self._entries)
+
+    def phase(self, entry_id: str, interval: float) -> float:
+        """Return the offset of ``entry_id`` within ``interval`` seconds."""
+        if entry_id not in self._entries:
+            return 0.0
+        return interval * self._entries.index(entry_id) / len(self._entries)
+
+    def next_delay(self, entry_id: str, interval: float) -> float:
+        """Return the delay until the next staggered poll of ``entry_id``."""
+        return seconds_until_slot(
+            self._clock(), interval, self.phase(entry_id, interval)
+        )
+
+    async def async_acquire(self, entry_id: Optional[str]) -> None:
+        """Wait until a request for ``entry_id`` may be sent.
+
+        The send time is reserved up front, so callers wait concurrently for
+        their own slot instead of queueing behind each other's sleep.
+        """
+        wait = self._bucket.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        stats = self._stats.get(entry_id)
+        if stats is not None:
+            stats.requests += 1
+            stats.waited += wait
+            stats.max_wait = max(stats.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        """Return scheduler state and fairness counters for diagnostics."""
+        total = sum(stats.requests for stats in self._stats.values())
+        entries = {}
+        for slot, entry_id in enumerate(self._entries):
+            stats = self._stats[entry_id]
+            entries[entry_id] = {
+                "slot": slot,
+                "requests": stats.requests,
+                "request_share": round(stats.requests / total, 3) if total else None,
+                "average_wait": round(stats.waited / stats.requests, 3)
+                if stats.requests
+                else 0.0,
+                "max_wait": round(stats.max_wait, 3),
+            }
+        return {
+            "rate": self._bucket.rate,
+            "burst": self._bucket.capacity,
+            "entries": entries,
+        }
@@ -1,9 +1,14 @@
 import logging
+from collections.abc import Iterator
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 import asyncio
+import json
+import time
 
 import aiohttp
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -13,8 +18,11 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import UnitOfTemperature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
@@ -22,27 +30,110 @@ from homeassistant.helpers.update_coordinator import (
 )
 
 from .const import (
+    ANOMALY_STORAGE_KEY,
+    ANOMALY_STORAGE_VERSION,
     CONF_PASSWORD,
     CONF_SENSORS,
     CONF_UPDATE_INTERVAL,
     CONF_USERNAME,
     CONF_COST_PER_KWH,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_MAX_SIZE,
+    CONF_EXPORT_PATH,
+    CONF_FIRE_EVENTS,
+    CONF_RECORD_TRAFFIC,
+    CONF_STATION_INFO_INTERVAL,
+    CONF_STATION_LIST_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
     DEFAULT_COST_PER_KWH,
+    DEFAULT_EXPORT_FORMAT,
+    DEFAULT_EXPORT_MAX_SIZE,
+    DEFAULT_EXPORT_PATH,
+    DEFAULT_FIRE_EVENTS,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_STATION_INFO_INTERVAL,
+    DEFAULT_STATION_LIST_INTERVAL,
+    DATA_TOKEN_HANDOFF,
     DOMAIN,
+    EVENT_STATION_DELTAS,
     LOGIN_ENDPOINT,
     REALTIME_POWER_ENDPOINT,
     STATION_INFO_ENDPOINT,
     STATION_LIST_ENDPOINT,
+    SIGNAL_STATION_DELTAS,
+    TOKEN_STORAGE_KEY,
+    TOKEN_STORAGE_VERSION,
+    TRAFFIC_DIR,
+    TRAFFIC_MAX_SIZE,
 )
+from .anomaly import AnomalyEngine
+from .auth import TokenCache, TokenCipher, login_token
+from .delta import station_delta
+from .entity import (
+    StationRefreshMixin,
+    async_add_entities_chunked,
+    station_device_info,
+    station_refreshed_signal,
+)
+from .export import (
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_NONE,
+    Snapshot,
+    SnapshotExporter,
+    create_writer,
+)
+from .fleet import FleetAggregate
 from .forecast import async_calculate_forecast
-from .util import parse_value, parse_frequency
+from .profiler import RefreshProfiler, write_profile
+from .table import StationTable
+from .tiers import TIER_STATION_INFO, TIER_STATION_LIST, TierSchedule
+from .traffic import (
+    REDACTED,
+    ReplayTiers,
+    ReplayTokens,
+    TrafficRecorder,
+    UnthrottledScheduler,
+    write_trace,
+)
+from .util import max_energy_jump, parse_value, parse_frequency
 
 _LOGGER = logging.getLogger(__name__)
 
-MAX_ENERGY_JUMP_KWH = 5
+# Shared stand-in for profiler stages while no profile is running
+_NO_PROFILE = nullcontext()
+ANOMALY_SAVE_DELAY = 300
+TOKEN_SAVE_DELAY = 1
 REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
+
+class AuthRejected(UpdateFailed):
+    """The API refused a request because of its credentials or token."""
+
+
+class InvalidResponse(UpdateFailed):
+    """A successful response came back without the requested data.
+
+    Rockcore answers some expired tokens this way instead of with 401/403.
+    """
+
+
+def _raise_for_status(resp) -> None:
+    if resp.status in (401, 403):
+        raise AuthRejected(f"Request rejected with status {resp.status}")
+    resp.raise_for_status()
+
+
+# Raw inverter fields kept alongside sensor values for attributes and deltas
+INVERTER_ATTRIBUTE_KEYS = [
+    "status",
+    "cstatus",
+    "time",
+    "smuId",
+    "invModelId",
+    "smuModelId",
+    "cmpCount",
+]
+
 SENSOR_DESCRIPTIONS: list[SensorEntityDescription] = [
     SensorEntityDescription(
         key="power_total",
@@ -149,12 +240,14 @@ SENSOR_DESCRIPTIONS: list[SensorEntityDescription] = [
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement="kW",
         state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
     ),
     SensorEntityDescription(
         key="component_count",
         translation_key="component_count",
         native_unit_of_measurement="",
         state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
     ),
     SensorEntityDescription(
         key="inverter_efficiency",
@@ -173,33 +266,96 @@ SENSOR_DESCRIPTIONS: list[SensorEntityDescription] = [
         key="last_update_time",
         translation_key="last_update_time",
         device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=False,
     ),
 ]
 
 SENSOR_TYPES = {desc.key: desc for desc in SENSOR_DESCRIPTIONS}
 
+# Sensor keys stored as parsed floats in the coordinator's station table
+NUMERIC_KEYS = [
+    desc.key
+    for desc in SENSOR_DESCRIPTIONS
+    if desc.device_class != SensorDeviceClass.TIMESTAMP
+]
+
+FLEET_SENSOR_DESCRIPTIONS: list[SensorEntityDescription] = [
+    SensorEntityDescription(
+        key="fleet_power_total",
+        translation_key="fleet_power_total",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement="W",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="fleet_total_energy",
+        translation_key="fleet_total_energy",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement="kWh",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="fleet_today_energy",
+        translation_key="fleet_today_energy",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement="kWh",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="fleet_producing_stations",
+        translation_key="fleet_producing_stations",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="fleet_faulted_stations",
+        translation_key="fleet_faulted_stations",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="fleet_offline_stations",
+        translation_key="fleet_offline_stations",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="fleet_utilization",
+        translation_key="fleet_utilization",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+]
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
     options = entry.options
-    coordinator = RockcoreDataUpdateCoordinator(hass, entry.data, options)
-    await coordinator.async_config_entry_first_refresh()
-    hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
     enabled_sensors = options.get(
         CONF_SENSORS, [desc.key for desc in SENSOR_DESCRIPTIONS]
     )
-    entities = []
+    # The first refresh already fetched every value, so entities are added
+    # without another update and built in chunks to keep the event loop
+    # responsive
+    await async_add_entities_chunked(
+        async_add_entities,
+        build_sensor_entities(coordinator, entry.entry_id, enabled_sensors),
+    )
+
+
+def build_sensor_entities(coordinator, entry_id, enabled_sensors) -> Iterator:
+    """Yield the sensor entities for every station and the fleet device."""
+    enabled = set(enabled_sensors)
+    descriptions = [desc for desc in SENSOR_DESCRIPTIONS if desc.key in enabled]
     for station_id in coordinator.station_ids:
         inverter = coordinator.data.get(station_id, {})
-        for description in SENSOR_DESCRIPTIONS:
-            if description.key in enabled_sensors and description.key in inverter:
-                entities.append(RockcoreSensor(coordinator, station_id, description))
-
-    async_add_entities(entities, True)
+        for description in descriptions:
+            if description.key in inverter:
+                yield RockcoreSensor(coordinator, station_id, description)
+    for description in FLEET_SENSOR_DESCRIPTIONS:
+        yield RockcoreFleetSensor(coordinator, entry_id, description)
 
 
-class RockcoreSensor(CoordinatorEntity, SensorEntity):
+class RockcoreSensor(StationRefreshMixin, CoordinatorEntity, SensorEntity):
     def __init__(
         self,
         coordinator: "RockcoreDataUpdateCoordinator",
@@ -212,12 +368,13 @@ class RockcoreSensor(CoordinatorEntity, SensorEntity):
         self.entity_description = description
         self._attr_unique_id = f"rockcore_{station_id}_{description.key}"
         self._attr_has_entity_name = True
+        self._attr_device_info = station_device_info(coordinator, station_id)
 
     @property
     def native_value(self):
         """Return the value reported by the sensor in its native unit."""
 
-        value = self.coordinator.data.get(self.station_id, {}).get(self.key)
+        value = self.coordinator.data.value(self.station_id, self.key)
 
         # Special handling for frequency sensor
         if self.key == "gridseq":
@@ -262,35 +419,117 @@ class RockcoreSensor(CoordinatorEntity, SensorEntity):
 
     # Removed async_update as it's handled by CoordinatorEntity
 
-    @property
-    def device_info(self):
-        station_name = self.coordinator.station_names.get(
-            self.station_id, f"Station {self.station_id}"
+
+class RockcoreFleetSensor(StationRefreshMixin, CoordinatorEntity, SensorEntity):
+    """Account-level sensor aggregated over all stations."""
+
+    def __init__(
+        self,
+        coordinator: "RockcoreDataUpdateCoordinator",
+        entry_id: str,
+        description: SensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entry_id = entry_id
+        self.key = description.key
+        self.entity_description = description
+        self._attr_unique_id = f"rockcore_fleet_{entry_id}_{description.key}"
+        self._attr_has_entity_name = True
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"fleet_{entry_id}")},
+            name="Rockcore Fleet",
+            manufacturer="Rockcore Energy",
+            model="Station Fleet",
         )
-        return {
-            "identifiers": {(DOMAIN, self.station_id)},
-            "name": f"Rockcore {station_name}",
-            "manufacturer": "Rockcore Energy",
-            "model": "Solar Inverter",
-            "sw_version": "1.0.0",
-        }
+
+    @property
+    def native_value(self):
+        return self.coordinator.fleet.as_dict().get(self.key)
+
+    @property
+    def extra_state_attributes(self):
+        return {"station_count": len(self.coordinator.fleet.station_ids)}
 
 
 class RockcoreDataUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, config, options):
+    def __init__(self, hass, config, options, scheduler, entry_id=None):
+        self.entry_id = entry_id
         self.username = config[CONF_USERNAME]
         self.password = config[CONF_PASSWORD]
         self.station_ids = []
         self.station_names = {}
-        self.sensors = options.get(
-            CONF_SENSORS, [desc.key for desc in SENSOR_DESCRIPTIONS]
+        self.device_infos = {}
+        # Checked for every value of every station, so kept as a set
+        self.sensors = frozenset(
+            options.get(CONF_SENSORS, [desc.key for desc in SENSOR_DESCRIPTIONS])
         )
         self.cost_per_kwh = options.get(
             CONF_COST_PER_KWH, DEFAULT_COST_PER_KWH
         )
+        self.fire_events = options.get(CONF_FIRE_EVENTS, DEFAULT_FIRE_EVENTS)
         self.session = async_get_clientsession(hass)
+        self.recorder = None
+        self.trace_path = None
+        self.profiler = None
+        self._closes_cycle = False
+        if options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC):
+            self.recorder = TrafficRecorder(self.session)
+            self.session = self.recorder
+            self.trace_path = hass.config.path(
+                TRAFFIC_DIR,
+                f"{entry_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.jsonl.gz",
+            )
         update_seconds = options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+        self.base_interval = update_seconds
+        self.scheduler = scheduler
         self.failed_updates = 0
+        self.tokens = TokenCache()
+        self._token_cipher = None
+        self._token_store = Store(
+            hass,
+            TOKEN_STORAGE_VERSION,
+            TOKEN_STORAGE_KEY.format(entry_id=entry_id),
+            private=True,
+        )
+        self._station_refreshes = {}
+        self.fleet = FleetAggregate()
+        self.tiers = TierSchedule(
+            {
+                TIER_STATION_INFO: options.get(
+                    CONF_STATION_INFO_INTERVAL, DEFAULT_STATION_INFO_INTERVAL
+                ),
+                TIER_STATION_LIST: options.get(
+                    CONF_STATION_LIST_INTERVAL, DEFAULT_STATION_LIST_INTERVAL
+                ),
+            }
+        )
+        self._station_info = {}
+        # Station info fetch time, and the fetch time of the last energy
+        # values that passed the jump check
+        self._station_info_at = {}
+        self._energy_accepted_at = {}
+        self.anomalies = AnomalyEngine(parse_value)
+        self._anomaly_store = Store(
+            hass,
+            ANOMALY_STORAGE_VERSION,
+            ANOMALY_STORAGE_KEY.format(entry_id=entry_id),
+        )
+        self.table = StationTable(NUMERIC_KEYS, parse_value)
+        self.inverter_rows = {}
+        self.exporter = None
+        export_format = options.get(CONF_EXPORT_FORMAT, DEFAULT_EXPORT_FORMAT)
+        if export_format != EXPORT_FORMAT_NONE:
+            export_path = options.get(CONF_EXPORT_PATH, DEFAULT_EXPORT_PATH)
+            suffix = ".csv" if export_format == EXPORT_FORMAT_CSV else ".db"
+            if not export_path.endswith(suffix):
+                export_path += suffix
+            max_size = options.get(CONF_EXPORT_MAX_SIZE, DEFAULT_EXPORT_MAX_SIZE)
+            self.exporter = SnapshotExporter(
+                hass,
+                create_writer(
+                    export_format, hass.config.path(export_path), max_size * 1024 * 1024
+                ),
+            )
         super().__init__(
             hass,
             _LOGGER,
@@ -299,102 +538,500 @@ class RockcoreDataUpdateCoordinator(DataUpdateCoordinator):
         )
 
     async def _async_update_data(self):
+        if self.recorder is not None:
+            self.recorder.start_cycle()
+        if self.profiler is not None:
+            self.profiler.start_cycle()
+        try:
+            data = await self._async_update_stations()
+        except Exception:
+            if self.profiler is not None:
+                self.profiler.end_cycle(success=False)
+                self._async_check_profile()
+            raise
+        finally:
+            self._flush_traffic()
+        # Only the listener update following this refresh closes its cycle,
+        # not one from a targeted station refresh
+        self._closes_cycle = self.profiler is not None
+        return data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, timing the state writes while profiling."""
+        profiler = self.profiler
+        if profiler is None or not self._closes_cycle:
+            super().async_update_listeners()
+            return
+        self._closes_cycle = False
+        with profiler.stage("state_writes"):
+            super().async_update_listeners()
+        profiler.end_cycle()
+        self._async_check_profile()
+
+    def _stage(self, name: str):
+        """Return the profiler stage ``name``, or a no-op while not profiling."""
+        if self.profiler is None:
+            return _NO_PROFILE
+        return self.profiler.stage(name)
+
+    def async_start_profile(self, cycles: int, block_threshold=None) -> None:
+        """Profile the next ``cycles`` refresh cycles.
+
+        ``block_threshold`` is in seconds; when set, event loop stalls longer
+        than it are logged while the profile runs.
+        """
+        self.async_stop_profile()
+        self.profiler = RefreshProfiler(cycles, block_threshold)
+        self.profiler.start_block_monitor(
+            lambda coro: self.hass.async_create_background_task(
+                coro, f"{DOMAIN} block monitor {self.entry_id}"
+            )
+        )
+
+    @callback
+    def async_stop_profile(self) -> None:
+        """Drop a running profile without writing its report."""
+        if self.profiler is not None:
+            self.profiler.stop_block_monitor()
+            self.profiler = None
+
+    @callback
+    def _async_check_profile(self) -> None:
+        """Write the report once the requested cycles were profiled."""
+        profiler = self.profiler
+        if profiler is None or not profiler.done:
+            return
+        profiler.stop_block_monitor()
+        self.profiler = None
+        path = self.hass.config.path(
+            f"{DOMAIN}_profile_{self.entry_id}_"
+            f"{datetime.now().strftime('%Y%m%d%H%M%S')}.json"
+        )
+        _LOGGER.info("Writing refresh profile to %s", path)
+        self.hass.async_add_executor_job(write_profile, path, profiler.report())
+
+    def _flush_traffic(self) -> None:
+        """Write the requests recorded since the last flush in the executor."""
+        if self.recorder is None or not self.recorder.records:
+            return
+        self.hass.async_add_executor_job(
+            write_trace,
+            self.trace_path,
+            self.recorder.take_records(),
+            TRAFFIC_MAX_SIZE * 1024 * 1024,
+        ).add_done_callback(self._trace_written)
+
+    @callback
+    def _trace_written(self, future) -> None:
+        """Stop recording once the trace reached its size cap."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        if future.result() or self.recorder is None:
+            return
+        _LOGGER.warning(
+            "Traffic trace %s reached %s MB, recording stopped",
+            self.trace_path,
+            TRAFFIC_MAX_SIZE,
+        )
+        self.session = self.recorder.session
+        self.recorder = None
+
+    async def _async_update_stations(self):
         try:
             session = self.session
-            token = await self._login(session, self.username, self.password)
-            station_ids = await self._get_station_id(session, token)
-            self.station_ids = station_ids
-            data = {}
-            for station_id in station_ids:
-                power_data = await self._get_power(session, token, station_id)
-                energy = await self._get_total_energy(session, token, station_id)
-                energy = {k: v for k, v in energy.items() if k in self.sensors}
-
-                previous = self.data.get(station_id, {}) if self.data else {}
-                for key, new_val in energy.items():
-                    prev_val = previous.get(key)
-                    if prev_val is None or new_val is None:
-                        continue
-                    diff = new_val - prev_val
-                    if key == "total_energy" and diff < 0:
-                        _LOGGER.warning(
-                            "Ignoring decrease in %s for station %s: %s -> %s",
-                            key,
-                            station_id,
-                            prev_val,
-                            new_val,
-                        )
-                        energy[key] = prev_val
-                    elif key in ["total_energy", "today_energy"] and diff > MAX_ENERGY_JUMP_KWH:
-                        _LOGGER.warning(
-                            "Ignoring unrealistic jump in %s for station %s: %s -> %s",
-                            key,
-                            station_id,
-                            prev_val,
-                            new_val,
-                        )
-                        energy[key] = prev_val
-
-                inverter = power_data.get(station_id, {})
-                inverter.update(energy)
-                forecast = await async_calculate_forecast(
-                    inverter, self.cost_per_kwh
+            due = self.tiers.due_tiers()
+            list_refreshed = TIER_STATION_LIST in due or not self.station_ids
+            if self.recorder is not None:
+                # Lets a replay request the same tiers and login as this cycle
+                self.recorder.note_cycle(
+                    due=sorted(due), login=not self.tokens.valid(time.time())
                 )
-                forecast = {k: v for k, v in forecast.items() if k in self.sensors}
-                inverter.update(forecast)
-
-                # Add calculated sensors
-                calculated = await self._calculate_derived_sensors(station_id, inverter, energy)
-                calculated = {k: v for k, v in calculated.items() if k in self.sensors}
-                inverter.update(calculated)
+            fetched = await self._async_with_token(
+                session,
+                lambda token: self._async_fetch_stations(
+                    session, token, due, list_refreshed
+                ),
+            )
+            self.tiers.mark(due)
 
-                data[station_id] = inverter
+            # Update the station table in place once every fetch succeeded
+            data = self.table
+            removed = ()
+            if list_refreshed:
+                data.retain(self.station_ids)
+                self.anomalies.retain(self.station_ids)
+                removed = [s for s in self.fleet.station_ids if s not in data]
+            deltas = {}
+            with self._stage("parse_value"):
+                for station_id, values in fetched.items():
+                    delta = station_delta(data.write(station_id, values))
+                    if delta:
+                        deltas[station_id] = delta
+            self._update_anomalies(data)
 
-            self.failed_updates = 0
-            ir.async_delete_issue(self.hass, DOMAIN, "connection_error")
+            self._async_clear_failures()
+            self._handle_deltas(deltas, data, removed)
+            self._export_snapshots(data)
+            # Land the next poll on this entry's slot in the shared schedule
+            self.update_interval = timedelta(
+                seconds=self.scheduler.next_delay(self.entry_id, self.base_interval)
+            )
             return data
+        except ConfigEntryAuthFailed:
+            # Rejected credentials start a reauth flow instead of a repair issue
+            raise
         except Exception as err:
-            self.failed_updates += 1
-            if self.failed_updates >= 3:
-                ir.async_create_issue(
-                    self.hass,
-                    DOMAIN,
-                    "connection_error",
-                    is_fixable=False,
-                    severity=ir.IssueSeverity.ERROR,
-                    translation_key="connection_error",
-                )
+            self._async_count_failure()
             raise UpdateFailed(f"Error updating data: {err}")
 
+    @callback
+    def _async_clear_failures(self) -> None:
+        self.failed_updates = 0
+        ir.async_delete_issue(self.hass, DOMAIN, "connection_error")
+
+    @callback
+    def _async_count_failure(self) -> None:
+        """Raise a repair issue after three failed refreshes in a row."""
+        self.failed_updates += 1
+        if self.failed_updates >= 3:
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                "connection_error",
+                is_fixable=False,
+                severity=ir.IssueSeverity.ERROR,
+                translation_key="connection_error",
+            )
+
+    async def _async_fetch_stations(self, session, token, due, list_refreshed):
+        """Fetch the station list when due, then every station."""
+        if list_refreshed:
+            station_ids = await self._get_station_id(session, token)
+            self.station_ids = station_ids
+            self._station_info = {
+                k: v for k, v in self._station_info.items() if k in station_ids
+            }
+            self._station_info_at = {
+                k: v for k, v in self._station_info_at.items() if k in station_ids
+            }
+            self._energy_accepted_at = {
+                k: v for k, v in self._energy_accepted_at.items() if k in station_ids
+            }
+            self._report_demand()
+        fetched = {}
+        for station_id in self.station_ids:
+            fetched[station_id] = await self._async_fetch_station(
+                session, token, station_id, TIER_STATION_INFO in due
+            )
+        return fetched
+
+    def _report_demand(self) -> None:
+        """Tell the scheduler how many requests per second this entry needs."""
+        stations = len(self.station_ids)
+        periods = self.tiers.periods
+        self.scheduler.set_demand(
+            self.entry_id,
+            stations / self.base_interval
+            + stations / periods[TIER_STATION_INFO]
+            + 1 / periods[TIER_STATION_LIST],
+        )
+
+    async def _async_fetch_station(self, session, token, station_id, fetch_info=True):
+        """Fetch and derive all values for a single station.
+
+        Realtime power is always fetched. Station info is only requested when
+        ``fetch_info`` is set or nothing is cached yet, otherwise the last
+        fetched values are merged in.
+        """
+        power_data = await self._get_power(session, token, station_id)
+        station_info = self._station_info.get(station_id)
+        if fetch_info or station_info is None:
+            station_info = await self._get_total_energy(session, token, station_id)
+            self._station_info[station_id] = station_info
+            self._station_info_at[station_id] = time.monotonic()
+        # The realtime values become the station's row, the guarded station
+        # info is merged straight into it
+        inverter = power_data.get(station_id, {})
+
+        with self._stage("energy_guard"):
+            # Rejected gains are checked against the time since the last
+            # accepted reading, so a real gain is eventually accepted
+            fetched_at = self._station_info_at.get(station_id, 0.0)
+            accepted_at = self._energy_accepted_at.get(station_id, fetched_at)
+            max_jump = max_energy_jump(fetched_at - accepted_at)
+            jumped = False
+            for key, new_val in station_info.items():
+                if key not in self.sensors:
+                    continue
+                inverter[key] = new_val
+                prev_val = self.table.value(station_id, key)
+                if prev_val is None or new_val is None:
+                    continue
+                diff = new_val - prev_val
+                if key == "total_energy" and diff < 0:
+                    _LOGGER.warning(
+                        "Ignoring decrease in %s for station %s: %s -> %s",
+                        key,
+                        station_id,
+                        prev_val,
+                        new_val,
+                    )
+                    inverter[key] = prev_val
+                elif key in ["total_energy", "today_energy"] and diff > max_jump:
+                    _LOGGER.warning(
+                        "Ignoring unrealistic jump in %s for station %s: %s -> %s",
+                        key,
+                        station_id,
+                        prev_val,
+                        new_val,
+                    )
+                    inverter[key] = prev_val
+                    jumped = True
+            if not jumped:
+                self._energy_accepted_at[station_id] = fetched_at
+
+        with self._stage("forecast"):
+            forecast = await async_calculate_forecast(
+                inverter, self.cost_per_kwh
+            )
+        inverter.update((k, v) for k, v in forecast.items() if k in self.sensors)
+
+        # Add calculated sensors
+        with self._stage("derived_sensors"):
+            calculated = await self._calculate_derived_sensors(
+                station_id, inverter, station_info
+            )
+        inverter.update((k, v) for k, v in calculated.items() if k in self.sensors)
+
+        return inverter
+
+    async def async_refresh_station(self, station_id):
+        """Fetch fresh data for one station outside the regular schedule.
+
+        Concurrent requests for the same station share a single fetch. The
+        result is merged into the coordinator data without rescheduling the
+        next full refresh.
+        """
+        pending = self._station_refreshes.get(station_id)
+        if pending is None:
+            pending = self.hass.async_create_task(
+                self._async_refresh_station(station_id)
+            )
+            self._station_refreshes[station_id] = pending
+            pending.add_done_callback(
+                lambda _: self._station_refreshes.pop(station_id, None)
+            )
+        await asyncio.shield(pending)
+
+    async def _async_refresh_station(self, station_id):
+        if self.recorder is not None:
+            # Runs in its own task, so its requests get their own cycle
+            self.recorder.start_cycle()
+            self.recorder.note_cycle(
+                station=station_id, login=not self.tokens.valid(time.time())
+            )
+        try:
+            await self._async_refresh_station_values(station_id)
+        finally:
+            self._flush_traffic()
+
+    async def _async_refresh_station_values(self, station_id):
+        session = self.session
+        inverter = await self._async_with_token(
+            session,
+            lambda token: self._async_fetch_station(session, token, station_id),
+        )
+
+        data = self.table
+        delta = station_delta(data.write(station_id, inverter))
+        self._handle_deltas({station_id: delta} if delta else {}, data)
+        # Anomaly baselines only learn from the regular poll cadence
+        self._export_snapshots(data, [station_id])
+        self.data = data
+        # Only this station's entities and the fleet changed
+        async_dispatcher_send(
+            self.hass, station_refreshed_signal(self.entry_id, station_id)
+        )
+        async_dispatcher_send(self.hass, station_refreshed_signal(self.entry_id))
+
+    def _handle_deltas(self, deltas: dict, data: StationTable, removed=()) -> None:
+        """Apply the per-station changes of a refresh to the fleet and subscribers.
+
+        ``removed`` lists the stations dropped from the account, which is only
+        known when the station list was refreshed.
+        """
+        for station_id in removed:
+            self.fleet.remove(station_id)
+        for station_id in deltas:
+            self.fleet.update(station_id, data[station_id])
+        self._publish_deltas(deltas)
+
+    async def async_load_token(self) -> None:
+        """Restore the saved login token, or take the one from the config flow."""
+        stored = await self._token_store.async_load() or {}
+        self._token_cipher = await self.hass.async_add_executor_job(
+            TokenCipher, self.password, stored.get("salt")
+        )
+        if stored:
+            self.tokens.load(stored, self._token_cipher)
+        handoff = self.hass.data.get(DATA_TOKEN_HANDOFF, {}).pop(self.username, None)
+        if handoff is not None:
+            self.tokens.set(*handoff)
+            self._async_save_token()
+
+    async def _async_token(self, session) -> tuple[str, bool]:
+        """Return the token and whether it was issued by a login just now.
+
+        Only logs in when the cached token is missing or old.
+        """
+        if self.tokens.valid(time.time()):
+            return self.tokens.token, False
+        issued_at = time.time()
+        token = await self._login(session, self.username, self.password)
+        self.tokens.set(token, issued_at)
+        self._async_save_token()
+        return token, True
+
+    async def _async_with_token(self, session, fetch):
+        """Return ``await fetch(token)``, logging in again once if refused.
+
+        A reused token may have expired even when the API answers without
+        401/403, so a response missing its data also drops it before the
+        retry. Failures with a token issued just now are raised as they are.
+        """
+        token, fresh = await self._async_token(session)
+        try:
+            result = await fetch(token)
+        except InvalidResponse:
+            if fresh:
+                raise
+            self._async_reject_token()
+            token, _ = await self._async_token(session)
+            result = await fetch(token)
+        except AuthRejected:
+            self._async_reject_token()
+            token, _ = await self._async_token(session)
+            result = await fetch(token)
+        self._async_confirm_token()
+        return result
+
+    @callback
+    def _async_confirm_token(self) -> None:
+        if not self.tokens.confirmed:
+            self.tokens.confirm()
+            self._async_save_token()
+
+    @callback
+    def _async_reject_token(self) -> None:
+        self.tokens.reject(time.time())
+        self._async_save_token()
+
+    @callback
+    def _async_save_token(self) -> None:
+        if self._token_cipher is None:
+            return
+        self._token_store.async_delay_save(
+            lambda: self.tokens.as_dict(self._token_cipher), TOKEN_SAVE_DELAY
+        )
+
+    async def async_load_anomalies(self) -> None:
+        """Restore anomaly baselines saved before the last restart."""
+        stored = await self._anomaly_store.async_load()
+        if stored:
+            self.anomalies.load(stored)
+
+    async def async_save_anomalies(self) -> None:
+        """Write the anomaly baselines now instead of after the save delay.
+
+        Runs on unload so a reloaded entry does not read older baselines.
+        """
+        await self._anomaly_store.async_save(self.anomalies.as_dict())
+
+    def _update_anomalies(self, data) -> None:
+        """Feed each station's readings to its anomaly detectors."""
+        for station_id, values in data.items():
+            self.anomalies.update(station_id, values)
+        self._anomaly_store.async_delay_save(self.anomalies.as_dict, ANOMALY_SAVE_DELAY)
+
+    def _export_snapshots(self, data: StationTable, station_ids=None) -> None:
+        """Queue the normalized and raw snapshots of a refresh for export.
+
+        Only copies are taken here; rows are serialized in the executor.
+        """
+        if self.exporter is None:
+            return
+        if station_ids is None:
+            values = data.copy()
+            inverter_rows = dict(self.inverter_rows)
+        else:
+            values = {station_id: dict(data[station_id]) for station_id in station_ids}
+            inverter_rows = {
+                station_id: self.inverter_rows.get(station_id, [])
+                for station_id in station_ids
+            }
+        self.exporter.enqueue(
+            Snapshot.take(self.entry_id, values, inverter_rows, station_ids)
+        )
+
+    def _publish_deltas(self, deltas: dict) -> None:
+        """Send the per-station changes of this refresh to subscribers."""
+        if not deltas:
+            return
+        async_dispatcher_send(self.hass, SIGNAL_STATION_DELTAS, self.entry_id, deltas)
+        if self.fire_events:
+            self.hass.bus.async_fire(
+                EVENT_STATION_DELTAS,
+                {"entry_id": self.entry_id, "stations": deltas},
+            )
+
+    async def _post_json(self, session, url, **kwargs):
+        """POST a request and return its decoded JSON body."""
+        profiler = self.profiler
+        if profiler is None:
+            async with session.post(url, timeout=REQUEST_TIMEOUT, **kwargs) as resp:
+                _raise_for_status(resp)
+                return await resp.json()
+        # Split the network wait from decoding when profiling
+        with profiler.stage("network"):
+            async with session.post(url, timeout=REQUEST_TIMEOUT, **kwargs) as resp:
+                _raise_for_status(resp)
+                body = await resp.read()
+        with profiler.stage("json_decode"):
+            return json.loads(body)
+
     async def _login(self, session, username, password):
         url = LOGIN_ENDPOINT
         payload = {"loginType": "1", "loginName": username, "password": password}
+        await self.scheduler.async_acquire(self.entry_id)
         try:
-            async with session.post(url, json=payload, timeout=REQUEST_TIMEOUT) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
+            data = await self._post_json(session, url, json=payload)
+        except AuthRejected as err:
+            raise ConfigEntryAuthFailed("Rockcore rejected the credentials") from err
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
             _LOGGER.error("Login request failed: %s", err)
             raise UpdateFailed(f"Login request failed: {err}") from err
-        if "data" not in data or "token" not in data["data"]:
-            _LOGGER.error("Login response missing required fields: %s", data)
-            raise UpdateFailed("Missing token in login response")
-        return data["data"]["token"]
+        token = login_token(data)
+        if token is None:
+            # Same rule as the config flow, a login without a token means
+            # the credentials were refused
+            _LOGGER.error("Login response missing 'token': %s", data)
+            raise ConfigEntryAuthFailed("Rockcore refused the credentials")
+        return token
 
     async def _get_station_id(self, session, token):
         url = STATION_LIST_ENDPOINT
         headers = {"Authorization": token}
+        await self.scheduler.async_acquire(self.entry_id)
         try:
-            async with session.post(url, headers=headers, json={}, timeout=REQUEST_TIMEOUT) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
+            data = await self._post_json(session, url, headers=headers, json={})
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
             _LOGGER.error("Fetching station list failed: %s", err)
             raise UpdateFailed(f"Fetching station list failed: {err}") from err
         stations = data.get("data")
         if not stations:
             _LOGGER.error("Station list response missing 'data': %s", data)
-            raise UpdateFailed("Missing stationId in station list response")
+            raise InvalidResponse("Missing stationId in station list response")
         ids = [s.get("stationId") for s in stations if s.get("stationId") is not None]
         if not ids:
             _LOGGER.error("Station list response missing 'stationId': %s", data)
@@ -412,51 +1049,48 @@ class RockcoreDataUpdateCoordinator(DataUpdateCoordinator):
         url = REALTIME_POWER_ENDPOINT
         headers = {"Authorization": token}
         payload = {"stationId": station_id}
+        await self.scheduler.async_acquire(self.entry_id)
         try:
-            async with session.post(
-                url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT
-            ) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
+            data = await self._post_json(session, url, headers=headers, json=payload)
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
             _LOGGER.error("Fetching power data failed: %s", err)
             raise UpdateFailed(f"Fetching power data failed: {err}") from err
         inverters = data.get("data")
         if inverters is None:
             _LOGGER.error("Power data response missing 'data': %s", data)
-            raise UpdateFailed("Missing data in power response")
+            raise InvalidResponse("Missing data in power response")
+        self.inverter_rows[station_id] = inverters
         result = {}
         if not inverters:
             return {station_id: result}
         inv = inverters[0]
-        result = {
-            desc.key: inv.get(desc.key, "0")
-            for desc in SENSOR_DESCRIPTIONS
-            if desc.key in inv and desc.key in self.sensors
-        }
-        if "power_total" in self.sensors:
-            result["power_total"] = sum(
-                parse_value(inv.get(k, "0")) or 0.0 for k in ["power1", "power2"]
-            )
+        with self._stage("parse_value"):
+            result = {
+                desc.key: inv.get(desc.key, "0")
+                for desc in SENSOR_DESCRIPTIONS
+                if desc.key in inv and desc.key in self.sensors
+            }
+            result.update({k: inv[k] for k in INVERTER_ATTRIBUTE_KEYS if k in inv})
+            if "power_total" in self.sensors:
+                result["power_total"] = sum(
+                    parse_value(inv.get(k, "0")) or 0.0 for k in ["power1", "power2"]
+                )
         return {station_id: result}
 
     async def _get_total_energy(self, session, token, station_id):
         url = STATION_INFO_ENDPOINT
         headers = {"Authorization": token}
         payload = {"stationId": station_id}
+        await self.scheduler.async_acquire(self.entry_id)
         try:
-            async with session.post(
-                url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT
-            ) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
+            data = await self._post_json(session, url, headers=headers, json=payload)
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
             _LOGGER.error("Fetching energy data failed: %s", err)
             raise UpdateFailed(f"Fetching energy data failed: {err}") from err
         info = data.get("data")
         if info is None:
             _LOGGER.error("Energy data response missing 'data': %s", data)
-            raise UpdateFailed("Missing data in energy response")
+            raise InvalidResponse("Missing data in energy response")
 
         return {
             "total_energy": parse_value(info.get("totalEnergy")) or 0.0,
@@ -504,3 +1138,42 @@ class RockcoreDataUpdateCoordinator(DataUpdateCoordinator):
                 pass
 
         return calculated
+
+
+class ReplayCoordinator(RockcoreDataUpdateCoordinator):
+    """Coordinator refreshing from recorded traffic, isolated from the live one.
+
+    Requests go to the given replay session without rate limiting, tiers and
+    logins follow the recording, and nothing is saved, exported, published
+    or raised as a repair issue.
+    """
+
+    def __init__(self, hass, options, session):
+        options = {
+            **options,
+            CONF_EXPORT_FORMAT: EXPORT_FORMAT_NONE,
+            CONF_RECORD_TRAFFIC: False,
+            CONF_FIRE_EVENTS: False,
+        }
+        # Traces carry no credentials, logins are served from the recording
+        config = {CONF_USERNAME: REDACTED, CONF_PASSWORD: REDACTED}
+        super().__init__(hass, config, options, UnthrottledScheduler())
+        self.session = session
+        self.tiers = ReplayTiers(self.tiers)
+        self.tokens = ReplayTokens()
+
+    def _async_save_token(self) -> None:
+        return
+
+    def _update_anomalies(self, data) -> None:
+        for station_id, values in data.items():
+            self.anomalies.update(station_id, values)
+
+    def _publish_deltas(self, deltas: dict) -> None:
+        return
+
+    def _async_clear_failures(self) -> None:
+        self.failed_updates = 0
+
+    def _async_count_failure(self) -> None:
+        self.failed_updates += 1
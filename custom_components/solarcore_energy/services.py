@@ -0,0 +1,155 @@
+"""Services for the Rockcore Solar integration."""
+from __future__ import annotations
+
+import os
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    ATTR_BLOCK_THRESHOLD,
+    ATTR_CYCLES,
+    ATTR_DEVICE_ID,
+    ATTR_ENTRY_ID,
+    ATTR_SPEED,
+    ATTR_STATION_ID,
+    ATTR_TRACE,
+    DOMAIN,
+    SERVICE_PROFILE,
+    SERVICE_REFRESH,
+    SERVICE_REPLAY,
+    TRAFFIC_DIR,
+)
+from .traffic import async_replay, load_trace
+
+REFRESH_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_STATION_ID): cv.string,
+            vol.Optional(ATTR_DEVICE_ID): cv.string,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_STATION_ID, ATTR_DEVICE_ID),
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_BLOCK_THRESHOLD): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+    }
+)
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TRACE): cv.string,
+        vol.Optional(ATTR_SPEED, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _station_from_device(hass: HomeAssistant, device_id: str) -> str:
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        raise HomeAssistantError(f"Unknown device {device_id}")
+    for domain, identifier in device.identifiers:
+        if domain == DOMAIN:
+            return str(identifier)
+    raise HomeAssistantError(f"Device {device_id} is not a Rockcore station")
+
+
+def _find_coordinator(hass: HomeAssistant, station_id: str):
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        coordinator = entry_data.get("coordinator")
+        if coordinator is None:
+            continue
+        for known_id in coordinator.station_ids:
+            if str(known_id) == station_id:
+                return coordinator, known_id
+    raise HomeAssistantError(f"Unknown Rockcore station {station_id}")
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_handle_refresh(call: ServiceCall) -> None:
+        if ATTR_STATION_ID in call.data:
+            station_id = call.data[ATTR_STATION_ID]
+        else:
+            station_id = _station_from_device(hass, call.data[ATTR_DEVICE_ID])
+        coordinator, known_id = _find_coordinator(hass, station_id)
+        await coordinator.async_refresh_station(known_id)
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        entry_id = call.data.get(ATTR_ENTRY_ID)
+        coordinators = [
+            entry_data["coordinator"]
+            for key, entry_data in hass.data.get(DOMAIN, {}).items()
+            if "coordinator" in entry_data and entry_id in (None, key)
+        ]
+        if not coordinators:
+            raise HomeAssistantError(f"Unknown Rockcore entry {entry_id}")
+        threshold = call.data.get(ATTR_BLOCK_THRESHOLD)
+        for coordinator in coordinators:
+            coordinator.async_start_profile(
+                call.data[ATTR_CYCLES],
+                threshold / 1000 if threshold is not None else None,
+            )
+
+    async def async_handle_replay(call: ServiceCall) -> ServiceResponse:
+        # Only traces in the recording directory can be replayed
+        trace_dir = os.path.abspath(hass.config.path(TRAFFIC_DIR))
+        path = os.path.abspath(os.path.join(trace_dir, call.data[ATTR_TRACE]))
+        if os.path.dirname(path) != trace_dir:
+            raise HomeAssistantError(f"Traces must be in {trace_dir}")
+        try:
+            records = await hass.async_add_executor_job(load_trace, path)
+        except (OSError, ValueError) as err:
+            raise HomeAssistantError(f"Cannot read trace {path}: {err}") from err
+        options = {}
+        entry_id = call.data.get(ATTR_ENTRY_ID)
+        if entry_id is not None:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if entry is None or entry.domain != DOMAIN:
+                raise HomeAssistantError(f"Unknown Rockcore entry {entry_id}")
+            options = dict(entry.options)
+        coordinator = await async_replay(hass, records, options, call.data[ATTR_SPEED])
+        return {
+            "cycles": len(coordinator.session.cycle_numbers),
+            "last_update_success": coordinator.last_update_success,
+            "stations": {
+                str(station_id): dict(values)
+                for station_id, values in (coordinator.data or {}).items()
+            },
+        }
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_handle_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY,
+        async_handle_replay,
+        schema=REPLAY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,226 @@
+"""Columnar storage of per-station values updated in place."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_CAPACITY = 16
+
+_MISSING = object()
+_NAN = float("nan")
+
+
+class StationRow(Mapping):
+    """Read-only mapping view of one station's row in a ``StationTable``."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "StationTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._table._read(self._index, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._table.columns:
+            if self._table._read(self._index, key) is not _MISSING:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class StationTable(Mapping):
+    """Preallocated columns of station values with a station index map.
+
+    Numeric keys are parsed once on write and kept in ``array('d')`` columns
+    with NaN marking a missing value. Any other key (status codes, raw API
+    identifiers, timestamps) is kept in a plain list column. Writing a
+    station replaces its row in place and reports which keys changed, so a
+    refresh does not allocate a new dictionary per station.
+
+    The table behaves as a read-only ``Mapping`` of station ID to
+    ``StationRow`` so callers can keep using ``data.get(station_id, {})``.
+    """
+
+    def __init__(
+        self,
+        numeric_keys: Iterable[str],
+        parse: Callable[[Any], Optional[float]],
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        self._numeric_keys = frozenset(numeric_keys)
+        self._parse = parse
+        self._capacity = max(capacity, 1)
+        self._index: Dict[Any, int] = {}
+        self._ids: List[Any] = []
+        self._numeric: Dict[str, array] = {}
+        self._objects: Dict[str, list] = {}
+        self.columns: List[str] = []
+
+    # Mapping interface
+
+    def __getitem__(self, station_id: Any) -> StationRow:
+        return StationRow(self, self._index[station_id])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, station_id: object) -> bool:
+        return station_id in self._index
+
+    # Direct access
+
+    def index(self, station_id: Any) -> Optional[int]:
+        return self._index.get(station_id)
+
+    def value(self, station_id: Any, key: str) -> Any:
+        """Return one value without building a row view, or ``None``."""
+        index = self._index.get(station_id)
+        if index is None:
+            return None
+        column = self._numeric.get(key)
+        if column is not None:
+            value = column[index]
+            return None if value != value else value
+        value = self._read(index, key)
+        return None if value is _MISSING else value
+
+    def _read(self, index: int, key: str) -> Any:
+        column = self._numeric.get(key)
+        if column is not None:
+            value = column[index]
+            # NaN is the only value not equal to itself
+            return _MISSING if value != value else value
+        column = self._objects.get(key)
+        if column is not None:
+            return column[index]
+        return _MISSING
+
+    # Writes
+
+    def write(
+        self, station_id: Any, values: Mapping[str, Any]
+    ) -> Dict[str, Tuple[Any, Any]]:
+        """Replace the row of ``station_id`` and return ``{key: (old, new)}``.
+
+        Keys absent from ``values`` are cleared. Unchanged keys are not
+        reported.
+        """
+        index = self._index.get(station_id)
+        if index is None:
+            index = self._add(station_id)
+
+        changes: Dict[str, Tuple[Any, Any]] = {}
+        numeric_keys = self._numeric_keys
+        numeric = self._numeric
+        objects = self._objects
+        parse = self._parse
+        for key, raw in values.items():
+            if key in numeric_keys:
+                column = numeric.get(key)
+                if column is None:
+                    column = self._add_numeric(key)
+                # Derived values already arrive as floats, skip parsing them
+                new = raw if raw.__class__ is float else parse(raw)
+                old = column[index]
+                if new is None:
+                    if old != old:
+                        continue
+                    column[index] = _NAN
+                elif old == new:
+                    continue
+                else:
+                    column[index] = new
+                changes[key] = (None if old != old else old, new)
+            else:
+                column = objects.get(key)
+                if column is None:
+                    column = self._add_objects(key)
+                old = column[index]
+                if old is not _MISSING and old == raw:
+                    continue
+                column[index] = raw
+                changes[key] = (None if old is _MISSING else old, raw)
+
+        # Every key of ``values`` is a column now, so nothing can be missing
+        # when both have the same size
+        if len(values) == len(self.columns):
+            return changes
+        for key in self.columns:
+            if key in values:
+                continue
+            old = self._read(index, key)
+            if old is _MISSING:
+                continue
+            if key in self._numeric:
+                self._numeric[key][index] = _NAN
+            else:
+                self._objects[key][index] = _MISSING
+            changes[key] = (old, None)
+
+        return changes
+
+    def copy(self) -> "StationTable":
+        """Return an independent copy, cheap enough to take every refresh."""
+        table = StationTable(self._numeric_keys, self._parse, self._capacity)
+        table._index = dict(self._index)
+        table._ids = list(self._ids)
+        table._numeric = {key: column[:] for key, column in self._numeric.items()}
+        table._objects = {key: column[:] for key, column in self._objects.items()}
+        table.columns = list(self.columns)
+        return table
+
+    def retain(self, station_ids: Iterable[Any]) -> None:
+        """Drop every station not in ``station_ids`` and compact the columns."""
+        wanted = set(station_ids)
+        keep = [sid for sid in self._ids if sid in wanted]
+        if len(keep) == len(self._ids):
+            return
+        rows = [self._index[sid] for sid in keep]
+        for key, column in self._numeric.items():
+            compacted = array("d", (column[i] for i in rows))
+            compacted.extend([_NAN] * (self._capacity - len(rows)))
+            self._numeric[key] = compacted
+        for key, column in self._objects.items():
+            self._objects[key] = [column[i] for i in rows] + [_MISSING] * (
+                self._capacity - len(rows)
+            )
+        self._ids = keep
+        self._index = {sid: i for i, sid in enumerate(keep)}
+
+    def _add(self, station_id: Any) -> int:
+        if len(self._ids) == self._capacity:
+            self._grow()
+        index = len(self._ids)
+        self._ids.append(station_id)
+        self._index[station_id] = index
+        return index
+
+    def _grow(self) -> None:
+        extra = self._capacity
+        self._capacity += extra
+        for column in self._numeric.values():
+            column.extend([_NAN] * extra)
+        for column in self._objects.values():
+            column.extend([_MISSING] * extra)
+
+    def _add_numeric(self, key: str) -> array:
+        column = array("d", [_NAN]) * self._capacity
+        self._numeric[key] = column
+        self.columns.append(key)
+        return column
+
+    def _add_objects(self, key: str) -> list:
+        column = [_MISSING] * self._capacity
+        self._objects[key] = column
+        self.columns.append(key)
+        return column
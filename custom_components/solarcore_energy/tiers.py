@@ -0,0 +1,55 @@
+"""Polling tiers with independent refresh periods."""
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Iterable
+
+# Realtime power is fetched on every coordinator poll; these tiers refresh
+# less often and are merged from cache in between.
+TIER_STATION_INFO = "station_info"
+TIER_STATION_LIST = "station_list"
+
+
+class TierSchedule:
+    """Track which polling tiers are due for a refresh.
+
+    A tier is due when it has never been fetched or its period elapsed since
+    the last successful fetch.
+    """
+
+    def __init__(
+        self,
+        periods: Dict[str, float],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.periods = dict(periods)
+        self._clock = clock
+        self._fetched: Dict[str, float] = {}
+
+    def due(self, tier: str) -> bool:
+        last = self._fetched.get(tier)
+        if last is None:
+            return True
+        # Allow a little slack so a tier lands on the poll that reaches its period
+        return self._clock() - last >= self.periods.get(tier, 0) - 1
+
+    def due_tiers(self) -> set:
+        return {tier for tier in self.periods if self.due(tier)}
+
+    def mark(self, tiers: Iterable[str]) -> None:
+        """Record a successful fetch of ``tiers``."""
+        now = self._clock()
+        for tier in tiers:
+            self._fetched[tier] = now
+
+    def as_dict(self) -> dict:
+        now = self._clock()
+        return {
+            tier: {
+                "period": period,
+                "age": round(now - self._fetched[tier], 1)
+                if tier in self._fetched
+                else None,
+            }
+            for tier, period in self.periods.items()
+        }
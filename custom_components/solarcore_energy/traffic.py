@@ -0,0 +1,377 @@
+"""Record and replay raw Rockcore API traffic."""
+from __future__ import annotations
+
+import asyncio
+import copy
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+# Request and response fields that carry credentials or session tokens
+REDACT_KEYS = {"loginName", "password", "token", "Authorization"}
+
+# Marks the record describing a refresh cycle rather than a request
+CYCLE_RECORD = "cycle"
+
+_WRITE_LOCK = threading.Lock()
+
+# Recorder and cycle record of the refresh running in the current task, so
+# a targeted refresh running alongside a full one keeps its own records
+_CURRENT_CYCLE: ContextVar[Optional[Tuple["TrafficRecorder", dict]]] = ContextVar(
+    "solarcore_energy_traffic_cycle", default=None
+)
+
+
+def redact(value: Any) -> Any:
+    """Return a copy of ``value`` with credentials and tokens replaced."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in REDACT_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def write_trace(path: str, records: List[dict], max_bytes: int = 0) -> bool:
+    """Append records to a gzip-compressed JSON lines file.
+
+    Returns False without writing once the file reached ``max_bytes``.
+    """
+    with _WRITE_LOCK:
+        if max_bytes and os.path.exists(path) and os.path.getsize(path) >= max_bytes:
+            return False
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with gzip.open(path, "at", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(record, default=str) + "\n")
+    return True
+
+
+def load_trace(path: str) -> List[dict]:
+    """Return every record of a trace written by ``write_trace``."""
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+class _RecordedResponse:
+    """Response wrapper that records the decoded body once it is read."""
+
+    def __init__(self, recorder: "TrafficRecorder", record: dict, response) -> None:
+        self._recorder = recorder
+        self._record = record
+        self._response = response
+        self.status = response.status
+
+    def raise_for_status(self) -> None:
+        self._response.raise_for_status()
+
+    async def json(self, **kwargs):
+        data = await self._response.json(**kwargs)
+        self._record["response"] = redact(data)
+        return data
+
+    async def read(self) -> bytes:
+        body = await self._response.read()
+        try:
+            self._record["response"] = redact(json.loads(body))
+        except ValueError:
+            self._record["response"] = None
+        return body
+
+
+class _RecordingRequest:
+    def __init__(self, recorder: "TrafficRecorder", context, record: dict) -> None:
+        self._recorder = recorder
+        self._context = context
+        self._record = record
+        self._start = 0.0
+
+    async def __aenter__(self):
+        self._start = time.monotonic()
+        self._record["t"] = round(self._start - self._recorder.started, 3)
+        try:
+            response = await self._context.__aenter__()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self._record["error"] = type(err).__name__
+            self._finish()
+            raise
+        self._record["status"] = response.status
+        return _RecordedResponse(self._recorder, self._record, response)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            return await self._context.__aexit__(exc_type, exc, tb)
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        self._record["duration"] = round(time.monotonic() - self._start, 3)
+        self._recorder.records.append(self._record)
+
+
+class TrafficRecorder:
+    """Session wrapper that records every request with its response and timing.
+
+    Credentials and tokens are redacted before a record is kept. Records are
+    buffered in memory and written with ``write_trace`` by the caller. Each
+    refresh cycle, full or targeted, also gets a record of its own carrying
+    the details added with ``note_cycle``. The current cycle is tracked per
+    task, so cycles running at the same time do not mix their requests.
+    """
+
+    def __init__(self, session) -> None:
+        self.session = session
+        self.records: List[dict] = []
+        self.started = time.monotonic()
+        self.cycle = 0
+
+    def start_cycle(self) -> None:
+        self.cycle += 1
+        record = {
+            "cycle": self.cycle,
+            "type": CYCLE_RECORD,
+            "t": round(time.monotonic() - self.started, 3),
+        }
+        self.records.append(record)
+        _CURRENT_CYCLE.set((self, record))
+
+    def _cycle_record(self) -> Optional[dict]:
+        current = _CURRENT_CYCLE.get()
+        if current is None or current[0] is not self:
+            return None
+        return current[1]
+
+    def note_cycle(self, **info: Any) -> None:
+        """Add details of the current cycle, such as the tiers that were due."""
+        record = self._cycle_record()
+        if record is not None:
+            record.update(info)
+
+    def take_records(self) -> List[dict]:
+        records, self.records = self.records, []
+        return records
+
+    def post(self, url, *, json=None, headers=None, **kwargs):
+        cycle = self._cycle_record()
+        record = {
+            "cycle": cycle["cycle"] if cycle is not None else self.cycle,
+            "method": "POST",
+            "url": url,
+            "headers": redact(dict(headers or {})),
+            "json": redact(json),
+        }
+        return _RecordingRequest(
+            self,
+            self.session.post(url, json=json, headers=headers, **kwargs),
+            record,
+        )
+
+
+class _ReplayResponse:
+    def __init__(self, record: dict) -> None:
+        self._record = record
+        self.status = record.get("status", 200)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status, message="Replayed error"
+            )
+
+    async def json(self, **kwargs):
+        return copy.deepcopy(self._record.get("response"))
+
+    async def read(self) -> bytes:
+        return json.dumps(self._record.get("response")).encode()
+
+
+class _ReplayRequest:
+    def __init__(self, record: dict, speed: float) -> None:
+        self._record = record
+        self._speed = speed
+
+    async def __aenter__(self):
+        if self._speed > 0:
+            await asyncio.sleep(self._record.get("duration", 0) / self._speed)
+        if "error" in self._record:
+            if self._record["error"] == "TimeoutError":
+                raise asyncio.TimeoutError
+            raise aiohttp.ClientError(f"Replayed {self._record['error']}")
+        return _ReplayResponse(self._record)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class UnthrottledScheduler:
+    """Scheduler stand-in so replays are not held back by the rate limit."""
+
+    async def async_acquire(self, entry_id) -> None:
+        return None
+
+    def next_delay(self, entry_id, interval: float) -> float:
+        return interval
+
+    def set_demand(self, entry_id, requests_per_second: float) -> None:
+        return None
+
+
+class ReplayTiers:
+    """Tier schedule stand-in repeating the tiers that were due when recording.
+
+    Traces recorded without cycle details fall back to the wrapped schedule.
+    """
+
+    def __init__(self, tiers) -> None:
+        self._tiers = tiers
+        self.periods = tiers.periods
+        self._due: Optional[set] = None
+
+    def start_cycle(self, due: Optional[List[str]]) -> None:
+        self._due = set(due) if due is not None else None
+
+    def due_tiers(self) -> set:
+        if self._due is not None:
+            return set(self._due)
+        return self._tiers.due_tiers()
+
+    def mark(self, tiers) -> None:
+        self._tiers.mark(tiers)
+
+    def as_dict(self) -> dict:
+        return self._tiers.as_dict()
+
+
+class ReplayTokens:
+    """Token cache stand-in that logs in at the cycles the recording did.
+
+    A cycle recorded without a login reused a token, possibly one obtained
+    before the trace started, so a placeholder stands in for it. Logins
+    after a replayed rejection happen as they did live.
+    """
+
+    def __init__(self) -> None:
+        self.token: Optional[str] = None
+        self.confirmed = False
+        self._login: Optional[bool] = None
+
+    def start_cycle(self, login: Optional[bool]) -> None:
+        self._login = login
+
+    def valid(self, now: float) -> bool:
+        login, self._login = self._login, None
+        if login:
+            return False
+        if login is not None and self.token is None:
+            self.token = REDACTED
+        return self.token is not None
+
+    def set(self, token: str, issued_at: float) -> None:
+        self.token = token
+        self.confirmed = False
+
+    def confirm(self) -> None:
+        self.confirmed = True
+
+    def reject(self, now: float) -> None:
+        self.token = None
+        self.confirmed = False
+
+
+class ReplaySession:
+    """Offline stand-in for the aiohttp session serving recorded responses.
+
+    Requests are matched to records of the current cycle by URL and
+    ``stationId``. A ``speed`` of 1 reproduces the recorded network time,
+    larger values replay faster and 0 replays without waiting. Cycle records
+    are kept apart in ``cycle_info``.
+    """
+
+    def __init__(self, records: List[dict], speed: float = 1.0) -> None:
+        self.speed = speed
+        self.cycles: Dict[int, List[dict]] = {}
+        self.cycle_info: Dict[int, dict] = {}
+        for record in records:
+            cycle = record.get("cycle", 0)
+            if record.get("type") == CYCLE_RECORD:
+                self.cycle_info[cycle] = record
+            else:
+                self.cycles.setdefault(cycle, []).append(record)
+        self._pending: List[dict] = []
+
+    @property
+    def cycle_numbers(self) -> List[int]:
+        return sorted(set(self.cycles) | set(self.cycle_info))
+
+    def cycle_start(self, cycle: int) -> float:
+        """Return when ``cycle`` started, relative to the recording start."""
+        if cycle in self.cycle_info:
+            return self.cycle_info[cycle].get("t", 0)
+        return min(record.get("t", 0) for record in self.cycles[cycle])
+
+    def start_cycle(self, cycle: int) -> None:
+        self._pending = list(self.cycles.get(cycle, []))
+
+    def _match(self, url: str, payload: Optional[dict]) -> dict:
+        station_id = (payload or {}).get("stationId")
+        for index, record in enumerate(self._pending):
+            if record["url"] != url:
+                continue
+            if (record.get("json") or {}).get("stationId") == station_id:
+                return self._pending.pop(index)
+        raise aiohttp.ClientError(f"No recorded response for {url} {station_id}")
+
+    def post(self, url, *, json=None, headers=None, **kwargs):
+        return _ReplayRequest(self._match(url, json), self.speed)
+
+
+async def async_replay(
+    hass, records: List[dict], options: Optional[dict] = None, speed: float = 1.0
+):
+    """Run recorded traffic through a separate coordinator and return it.
+
+    The replay coordinator uses ``options``, normally those of the entry the
+    trace was recorded for, but shares no state with any live entry and does
+    not need one to be loaded: its requests are served by a
+    ``ReplaySession``, it is not rate limited and it neither persists,
+    publishes nor exports anything. Each recorded cycle is refreshed with
+    the tiers and login the recording had, targeted cycles refreshing only
+    their station, waiting the recorded gap between cycles divided by
+    ``speed``.
+    """
+    # The sensor platform imports this module, so import it lazily
+    from .sensor import ReplayCoordinator
+
+    session = ReplaySession(records, speed)
+    coordinator = ReplayCoordinator(hass, options or {}, session)
+    previous_start = None
+    for cycle in session.cycle_numbers:
+        start = session.cycle_start(cycle)
+        if previous_start is not None and speed > 0:
+            await asyncio.sleep(max(start - previous_start, 0) / speed)
+        previous_start = start
+        info = session.cycle_info.get(cycle, {})
+        session.start_cycle(cycle)
+        coordinator.tiers.start_cycle(info.get("due"))
+        coordinator.tokens.start_cycle(info.get("login"))
+        if info.get("station") is not None:
+            try:
+                await coordinator.async_refresh_station(info["station"])
+            except Exception as err:  # pylint: disable=broad-except
+                # Failed targeted refreshes were recorded too, keep going
+                _LOGGER.debug("Replayed refresh of %s failed: %s", info["station"], err)
+        else:
+            await coordinator.async_refresh()
+    return coordinator
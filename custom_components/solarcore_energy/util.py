@@ -3,6 +3,18 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
+# Unit suffixes and the factor converting them to the integration's units
+UNIT_MULTIPLIERS = {
+    "kw": 1000.0,  # kilowatts -> watts
+    "w": 1.0,      # watts
+    "kwh": 1.0,    # kilowatt-hours
+    "wh": 0.001,   # watt-hours -> kilowatt-hours
+}
+
+# Largest plausible energy gain between two readings ENERGY_JUMP_INTERVAL
+# seconds apart, which rejects gains faster than 600 kW
+MAX_ENERGY_JUMP_KWH = 5
+ENERGY_JUMP_INTERVAL = 30
 
 def parse_value(value: Any) -> Optional[float]:
     """Parse a numeric value from API strings.
@@ -23,13 +35,7 @@ def parse_value(value: Any) -> Optional[float]:
 
     text = str(value).strip().lower()
 
-    multipliers = {
-        "kw": 1000.0,  # kilowatts -> watts
-        "w": 1.0,      # watts
-        "kwh": 1.0,    # kilowatt-hours
-        "wh": 0.001,   # watt-hours -> kilowatt-hours
-    }
-    for unit, multiplier in multipliers.items():
+    for unit, multiplier in UNIT_MULTIPLIERS.items():
         if text.endswith(unit):
             text = text[:-len(unit)]
             try:
@@ -46,6 +52,15 @@ def parse_value(value: Any) -> Optional[float]:
         return None
 
 
+def max_energy_jump(elapsed: float) -> float:
+    """Return the largest plausible energy gain in kWh over ``elapsed`` seconds.
+
+    The limit grows with the time between readings so slower polling does
+    not reject the normal production of large stations.
+    """
+    return MAX_ENERGY_JUMP_KWH * max(elapsed, ENERGY_JUMP_INTERVAL) / ENERGY_JUMP_INTERVAL
+
+
 def parse_frequency(value: Any) -> Optional[float]:
     """Parse frequency value from API.
 
@@ -0,0 +1,44 @@
+"""Websocket API for the Rockcore Solar integration."""
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_STATION_DELTAS
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_deltas)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_deltas",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe_deltas(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Stream per-station changes after each coordinator refresh."""
+    entry_filter = msg.get("entry_id")
+
+    @callback
+    def forward_deltas(entry_id: str, deltas: dict) -> None:
+        if entry_filter is not None and entry_id != entry_filter:
+            return
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"entry_id": entry_id, "stations": deltas}
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_STATION_DELTAS, forward_deltas
+    )
+    connection.send_result(msg["id"])
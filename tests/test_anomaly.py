@@ -0,0 +1,68 @@
+import importlib.util
+import json
+from pathlib import Path
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "anomaly.py"
+)
+spec = importlib.util.spec_from_file_location("anomaly", MODULE_PATH)
+anomaly = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(anomaly)
+
+
+def parse(value):
+    return float(value) if value is not None else None
+
+
+def feed_balanced(engine, samples):
+    for index in range(samples):
+        jitter = (index % 5) * 2.0
+        engine.update(1, {"power1": 200 + jitter, "power2": 200 - jitter})
+
+
+def test_sustained_string_drift_raises_anomaly():
+    engine = anomaly.AnomalyEngine(parse)
+    feed_balanced(engine, anomaly.ANOMALY_WARMUP + 20)
+    tracker = engine.tracker(1, anomaly.STRING_RATIO)
+    assert not tracker.active
+
+    for _ in range(anomaly.ANOMALY_SUSTAIN - 1):
+        engine.update(1, {"power1": 300, "power2": 100})
+    assert not tracker.active
+    engine.update(1, {"power1": 300, "power2": 100})
+    assert tracker.active
+
+    engine.update(1, {"power1": 200, "power2": 200})
+    assert not tracker.active
+
+
+def test_low_production_is_ignored():
+    engine = anomaly.AnomalyEngine(parse)
+    engine.update(1, {"power1": 10, "power2": 0})
+    assert engine.tracker(1, anomaly.STRING_RATIO).stats.count == 0
+
+
+def test_state_round_trip_through_json():
+    engine = anomaly.AnomalyEngine(parse)
+    feed_balanced(engine, 10)
+    stored = json.loads(json.dumps(engine.as_dict()))
+
+    restored = anomaly.AnomalyEngine(parse)
+    restored.load(stored)
+    assert restored.as_dict() == stored
+    restored.update(1, {"power1": 200, "power2": 200})
+    assert restored.tracker(1, anomaly.STRING_RATIO).stats.count == 11
+
+
+def test_retain_forgets_removed_stations():
+    engine = anomaly.AnomalyEngine(parse)
+    engine.load({"2": {}, "3": {}})
+    engine.update(1, {"power1": 200, "power2": 200})
+    engine.update(4, {"power1": 200, "power2": 200})
+
+    engine.retain([1, 2])
+    assert set(engine.as_dict()) == {"1", "2"}
+    assert engine.tracker(4, anomaly.STRING_RATIO) is None
@@ -0,0 +1,102 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "auth.py"
+)
+spec = importlib.util.spec_from_file_location("auth", MODULE_PATH)
+auth = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(auth)
+
+
+def test_token_round_trips_encrypted():
+    cipher = auth.TokenCipher("secret")
+    cache = auth.TokenCache()
+    cache.set("abc123", 1000.0)
+    cache.confirm()
+
+    stored = cache.as_dict(cipher)
+    assert "abc123" not in str(stored)
+
+    restored = auth.TokenCache()
+    restored.load(stored, auth.TokenCipher("secret", stored["salt"]))
+    assert restored.token == "abc123"
+    assert restored.issued_at == 1000.0
+    assert restored.confirmed
+
+
+def test_other_password_cannot_read_token():
+    cache = auth.TokenCache()
+    cache.set("abc123", 1000.0)
+    stored = cache.as_dict(auth.TokenCipher("secret"))
+
+    restored = auth.TokenCache()
+    restored.load(stored, auth.TokenCipher("changed", stored["salt"]))
+    assert restored.token is None
+    assert not restored.valid(1000.0)
+
+
+def test_rejection_bounds_lifetime():
+    cache = auth.TokenCache()
+    cache.set("abc123", 0.0)
+    cache.confirm()
+    assert cache.valid(10_000.0)
+
+    cache.reject(7200.0)
+    assert cache.token is None
+    assert cache.lifetime == 7200.0
+
+    cache.set("def456", 10_000.0)
+    assert cache.valid(10_000.0 + 7200.0 - auth.EXPIRY_MARGIN - 1)
+    assert not cache.valid(10_000.0 + 7200.0 - auth.EXPIRY_MARGIN)
+
+
+def test_unconfirmed_rejection_keeps_lifetime():
+    cache = auth.TokenCache()
+    cache.set("abc123", 0.0)
+    cache.reject(5.0)
+    assert cache.lifetime is None
+
+
+def test_short_rejection_leaves_usable_lifetime():
+    cache = auth.TokenCache()
+    cache.set("abc123", 0.0)
+    cache.confirm()
+    cache.reject(200.0)
+    assert cache.lifetime == auth.MIN_LIFETIME
+
+    cache.set("def456", 1000.0)
+    assert cache.valid(1000.0)
+    assert cache.valid(1000.0 + auth.MIN_LIFETIME - auth.EXPIRY_MARGIN - 1)
+
+
+def test_unrejected_renewal_relaxes_lifetime():
+    cache = auth.TokenCache()
+    cache.set("abc123", 0.0)
+    cache.confirm()
+    cache.reject(3600.0)
+
+    cache.set("def456", 4000.0)
+    cache.confirm()
+    assert not cache.valid(4000.0 + 3600.0 - auth.EXPIRY_MARGIN)
+    cache.set("ghi789", 7300.0)
+    assert cache.lifetime == 3600.0 * auth.LIFETIME_GROWTH
+    assert cache.valid(7300.0 + 3600.0)
+
+    # An unconfirmed token says nothing about the lifetime
+    cache.set("jkl012", 8000.0)
+    assert cache.lifetime == 3600.0 * auth.LIFETIME_GROWTH
+
+
+def test_stored_short_lifetime_is_raised():
+    cipher = auth.TokenCipher("secret")
+    cache = auth.TokenCache()
+    cache.load({"salt": cipher.salt, "lifetime": 200.0}, cipher)
+    assert cache.lifetime == auth.MIN_LIFETIME
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import issue_registry as ir  # noqa: E402
+from homeassistant.helpers.dispatcher import async_dispatcher_connect  # noqa: E402
+
+from custom_components.solarcore_energy import const, sensor  # noqa: E402
+from custom_components.solarcore_energy.entity import (  # noqa: E402
+    station_refreshed_signal,
+)
+from custom_components.solarcore_energy.scheduler import (  # noqa: E402
+    RequestScheduler,
+)
+from custom_components.solarcore_energy.services import (  # noqa: E402
+    async_register_services,
+)
+
+CONFIG = {const.CONF_USERNAME: "user", const.CONF_PASSWORD: "secret"}
+
+
+class FakeResponse:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise sensor.aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def json(self, **kwargs):
+        return self.body
+
+    async def read(self):
+        return json.dumps(self.body).encode()
+
+
+class FakeApi:
+    """Rockcore API stand-in serving two stations and counting requests."""
+
+    def __init__(self):
+        self.requests = []
+        self.power = {1: "20W", 2: "30W"}
+        self.gate = None
+        self.logins = 0
+        # Tokens answered like Rockcore answers some expired ones
+        self.expired = set()
+        self.refuse_login = False
+
+    def post(self, url, *, json=None, headers=None, **kwargs):
+        self.requests.append(url)
+        return self._respond(url, json or {}, (headers or {}).get("Authorization"))
+
+    def _respond(self, url, payload, token):
+        api = self
+
+        class Request(FakeResponse):
+            async def __aenter__(self):
+                if url == const.REALTIME_POWER_ENDPOINT and api.gate is not None:
+                    await api.gate.wait()
+                return self
+
+        if url == const.LOGIN_ENDPOINT:
+            if self.refuse_login:
+                return Request({"code": 1, "msg": "wrong password"})
+            self.logins += 1
+            return Request({"data": {"token": f"tok{self.logins}"}})
+        if token in self.expired:
+            return Request({"code": 401, "msg": "token expired"})
+        if url == const.STATION_LIST_ENDPOINT:
+            return Request(
+                {"data": [{"stationId": 1, "stationName": "A"}, {"stationId": 2}]}
+            )
+        station_id = payload["stationId"]
+        if url == const.REALTIME_POWER_ENDPOINT:
+            return Request({"data": [{"power1": self.power[station_id]}]})
+        return Request(
+            {"data": {"totalEnergy": "100kWh", "todayEnergy": "3kWh", "capacity": "10"}}
+        )
+
+    def count(self, url):
+        return self.requests.count(url)
+
+
+def run(test, config_dir, options=None):
+    """Run ``test(hass, coordinator, api)`` against a coordinator on a fake API."""
+    options = options or {}
+
+    async def main():
+        hass = HomeAssistant(str(config_dir))
+        await ir.async_load(hass)
+        coordinator = sensor.RockcoreDataUpdateCoordinator(
+            hass, CONFIG, options, RequestScheduler(1000.0, 1000), "entry"
+        )
+        api = FakeApi()
+        if coordinator.recorder is not None:
+            coordinator.recorder.session = api
+        else:
+            coordinator.session = api
+        try:
+            await test(hass, coordinator, api)
+        finally:
+            await hass.async_block_till_done()
+            await hass.async_stop(force=True)
+
+    asyncio.run(main())
+
+
+def test_concurrent_station_refreshes_share_one_fetch(tmp_path):
+    async def test(hass, coordinator, api):
+        await coordinator.async_refresh()
+        assert coordinator.data.value(1, "power1") == 20.0
+
+        listener_updates = []
+        coordinator.async_add_listener(lambda: listener_updates.append(True))
+        signals = []
+        for station_id in (1, 2, None):
+            async_dispatcher_connect(
+                hass,
+                station_refreshed_signal("entry", station_id),
+                lambda station_id=station_id: signals.append(station_id),
+            )
+
+        api.power[1] = "25W"
+        api.gate = asyncio.Event()
+        before = api.count(const.REALTIME_POWER_ENDPOINT)
+        calls = [
+            hass.async_create_task(coordinator.async_refresh_station(1))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        api.gate.set()
+        await asyncio.gather(*calls)
+
+        assert api.count(const.REALTIME_POWER_ENDPOINT) == before + 1
+        assert coordinator.data.value(1, "power1") == 25.0
+        assert coordinator.data.value(2, "power1") == 30.0
+        # Only the refreshed station and the fleet are notified
+        assert signals == [1, None]
+        assert listener_updates == []
+
+    run(test, tmp_path)
+
+
+def test_recorded_trace_replays_offline(tmp_path):
+    recorded = {}
+
+    async def record(hass, coordinator, api):
+        await coordinator.async_refresh()
+        api.power[1] = "25W"
+        await coordinator.async_refresh_station(1)
+        api.power[2] = "35W"
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        recorded["trace"] = Path(coordinator.trace_path).name
+        recorded["stations"] = {
+            str(station_id): dict(values)
+            for station_id, values in coordinator.data.items()
+        }
+
+    run(record, tmp_path, {const.CONF_RECORD_TRAFFIC: True})
+
+    async def replay():
+        # A fresh instance without any loaded entry, as when replaying offline
+        hass = HomeAssistant(str(tmp_path))
+        async_register_services(hass)
+        try:
+            return await hass.services.async_call(
+                const.DOMAIN,
+                const.SERVICE_REPLAY,
+                {const.ATTR_TRACE: recorded["trace"]},
+                blocking=True,
+                return_response=True,
+            )
+        finally:
+            await hass.async_block_till_done()
+            await hass.async_stop(force=True)
+
+    result = asyncio.run(replay())
+    assert result["cycles"] == 3
+    assert result["last_update_success"]
+    assert result["stations"] == recorded["stations"]
+    assert result["stations"]["1"]["power1"] == 25.0
+
+
+def test_token_expired_without_auth_status_is_renewed(tmp_path):
+    async def test(hass, coordinator, api):
+        await coordinator.async_refresh()
+        assert api.logins == 1
+
+        api.expired.add("tok1")
+        api.power[1] = "25W"
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert api.logins == 2
+        assert coordinator.tokens.token == "tok2"
+        assert coordinator.data.value(1, "power1") == 25.0
+
+        api.expired.add("tok2")
+        api.power[1] = "40W"
+        await coordinator.async_refresh_station(1)
+        assert api.logins == 3
+        assert coordinator.data.value(1, "power1") == 40.0
+
+    run(test, tmp_path)
+
+
+def test_login_without_token_starts_reauth(tmp_path):
+    async def test(hass, coordinator, api):
+        api.refuse_login = True
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        assert isinstance(coordinator.last_exception, sensor.ConfigEntryAuthFailed)
+        # Refused credentials are not counted towards the repair issue
+        assert coordinator.failed_updates == 0
+
+    run(test, tmp_path)
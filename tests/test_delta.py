@@ -0,0 +1,59 @@
+import importlib.util
+from pathlib import Path
+
+PACKAGE_PATH = Path(__file__).resolve().parents[1] / "custom_components" / "solarcore_energy"
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(name, PACKAGE_PATH / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+delta = load("delta")
+table_module = load("table")
+parse_value = load("util").parse_value
+
+
+def make_table():
+    return table_module.StationTable(["power_total", "today_energy"], parse_value)
+
+
+def test_first_refresh_reports_everything():
+    table = make_table()
+    changes = table.write(1, {"power_total": 120.0, "status": "0"})
+    assert delta.station_delta(changes) == {
+        "power_total": 120.0,
+        "status": {"from": None, "to": "0"},
+    }
+
+
+def test_unchanged_station_is_omitted():
+    table = make_table()
+    table.write(1, {"power_total": 120.0})
+    table.write(2, {"power_total": 80.0})
+    assert delta.station_delta(table.write(1, {"power_total": 120.0})) == {}
+    assert delta.station_delta(table.write(2, {"power_total": 90.0})) == {
+        "power_total": 90.0
+    }
+
+
+def test_energy_delta_and_status_transition():
+    table = make_table()
+    table.write(1, {"today_energy": 1.2, "status": "0", "cstatus": "1"})
+    changes = table.write(1, {"today_energy": 1.5, "status": "3", "cstatus": "1"})
+    assert delta.station_delta(changes) == {
+        "today_energy": 1.5,
+        "today_energy_delta": 0.3,
+        "status": {"from": "0", "to": "3"},
+    }
+
+
+def test_cleared_value_is_reported():
+    table = make_table()
+    table.write(1, {"power_total": 120.0, "status": "0"})
+    assert delta.station_delta(table.write(1, {"power_total": "N/A"})) == {
+        "power_total": None,
+        "status": {"from": "0", "to": None},
+    }
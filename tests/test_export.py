@@ -0,0 +1,63 @@
+import csv
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "export.py"
+)
+spec = importlib.util.spec_from_file_location("export", MODULE_PATH)
+export = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(export)
+
+DATA = {1: {"power_total": 120.0, "cstatus": "1"}}
+INVERTERS = {1: [{"smuId": "A1", "power1": "60W"}, {"smuId": "A2", "power1": "0W"}]}
+
+
+def test_build_rows_includes_raw_inverters():
+    rows = export.build_rows("entry", DATA, INVERTERS)
+    assert [row[3] for row in rows] == ["station", "inverter", "inverter"]
+    assert [row[4] for row in rows] == [None, 0, 1]
+    assert '"smuId": "A2"' in rows[2][5]
+
+
+def test_sqlite_writer_appends_batches(tmp_path):
+    writer = export.SqliteWriter(str(tmp_path / "export.db"), 0)
+    writer.write_rows(export.build_rows("entry", DATA, INVERTERS))
+    writer.write_rows(export.build_rows("entry", DATA, {}))
+    writer.close()
+
+    conn = sqlite3.connect(tmp_path / "export.db")
+    assert conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 4
+    conn.close()
+
+
+def test_csv_writer_rotates_by_size(tmp_path):
+    path = tmp_path / "export.csv"
+    writer = export.CsvWriter(str(path), 1)
+    writer.write_rows(export.build_rows("entry", DATA, {}))
+    writer.write_rows(export.build_rows("entry", DATA, {}))
+
+    assert len(list(tmp_path.glob("export.*.csv"))) == 1
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == export.COLUMNS
+    assert len(rows) == 2
+
+
+def test_snapshots_are_serialized_by_the_writer(tmp_path):
+    data = {1: dict(DATA[1])}
+    snapshot = export.Snapshot.take("entry", data, dict(INVERTERS))
+    writer = export.SqliteWriter(str(tmp_path / "export.db"), 0)
+    writer.write_snapshots([snapshot, export.Snapshot.take("entry", data, {}, [1])])
+    writer.close()
+
+    conn = sqlite3.connect(tmp_path / "export.db")
+    rows = conn.execute("SELECT time, kind, payload FROM snapshots").fetchall()
+    conn.close()
+    assert [row[1] for row in rows] == ["station", "inverter", "inverter", "station"]
+    assert rows[0][0] == snapshot.time
+    assert '"power_total": 120.0' in rows[0][2]
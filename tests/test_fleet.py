@@ -0,0 +1,68 @@
+import importlib.util
+from pathlib import Path
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "fleet.py"
+)
+spec = importlib.util.spec_from_file_location("fleet", MODULE_PATH)
+fleet = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(fleet)
+FleetAggregate = fleet.FleetAggregate
+
+
+def test_totals_and_counts():
+    aggregate = FleetAggregate()
+    aggregate.update(1, {"power_total": 400.0, "total_energy": 10.0, "status": "0"})
+    aggregate.update(2, {"power_total": 0.0, "total_energy": 5.0, "status": "2"})
+    aggregate.update(3, {})
+
+    values = aggregate.as_dict()
+    assert values["fleet_power_total"] == 400.0
+    assert values["fleet_total_energy"] == 15.0
+    assert values["fleet_producing_stations"] == 1
+    assert values["fleet_faulted_stations"] == 1
+    assert values["fleet_offline_stations"] == 1
+
+
+def test_update_replaces_previous_contribution():
+    aggregate = FleetAggregate()
+    aggregate.update(1, {"power_total": 400.0, "status": "0"})
+    aggregate.update(1, {"power_total": 250.0, "status": "0"})
+    assert aggregate.as_dict()["fleet_power_total"] == 250.0
+
+    aggregate.remove(1)
+    assert aggregate.as_dict()["fleet_power_total"] == 0.0
+    assert aggregate.station_ids == []
+
+
+def test_removed_station_keeps_energy_meters_increasing():
+    aggregate = FleetAggregate()
+    aggregate.update(1, {"total_energy": 100.0, "today_energy": 4.0})
+    aggregate.update(2, {"total_energy": 50.0, "today_energy": 2.0})
+
+    aggregate.remove(2)
+    values = aggregate.as_dict()
+    assert values["fleet_total_energy"] == 150.0
+    assert values["fleet_today_energy"] == 6.0
+
+    aggregate.update(1, {"total_energy": 101.0, "today_energy": 5.0})
+    assert aggregate.as_dict()["fleet_today_energy"] == 7.0
+
+    # The daily reset of station 1 also drops the removed station's today
+    aggregate.update(1, {"total_energy": 101.0, "today_energy": 0.0})
+    values = aggregate.as_dict()
+    assert values["fleet_today_energy"] == 0.0
+    assert values["fleet_total_energy"] == 151.0
+
+
+def test_utilization_is_capacity_weighted():
+    aggregate = FleetAggregate()
+    aggregate.update(1, {"station_capacity": 1.0, "inverter_efficiency": 80.0})
+    aggregate.update(2, {"station_capacity": 3.0, "inverter_efficiency": 40.0})
+    assert aggregate.as_dict()["fleet_utilization"] == 50.0
+
+    aggregate.update(3, {"station_capacity": 4.0})
+    assert aggregate.as_dict()["fleet_utilization"] == 25.0
@@ -0,0 +1,103 @@
+import asyncio
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "profiler.py"
+)
+spec = importlib.util.spec_from_file_location("profiler", MODULE_PATH)
+profiler = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(profiler)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stages_accumulate_per_cycle():
+    clock = FakeClock()
+    prof = profiler.RefreshProfiler(2, clock=clock)
+    prof.start_cycle()
+    with prof.stage("network"):
+        clock.now += 0.1
+    with prof.stage("network"):
+        clock.now += 0.05
+    with prof.stage("forecast"):
+        assert prof.current_stage == "forecast"
+        clock.now += 0.01
+    assert prof.current_stage is None
+    prof.end_cycle()
+
+    cycle = prof.results[0]
+    assert cycle["network"] == 150.0
+    assert cycle["forecast"] == 10.0
+    assert cycle["state_writes"] == 0.0
+    assert cycle["total"] == 160.0
+    assert cycle["success"] is True
+    assert not prof.done
+
+
+def test_report_averages_cycles(tmp_path):
+    clock = FakeClock()
+    prof = profiler.RefreshProfiler(2, clock=clock)
+    for elapsed in (0.01, 0.03):
+        prof.start_cycle()
+        with prof.stage("json_decode"):
+            clock.now += elapsed
+        prof.end_cycle()
+    # Closing a cycle that was never started is ignored
+    prof.end_cycle(success=False)
+    assert prof.done
+
+    report = prof.report()
+    assert len(report["cycles"]) == 2
+    assert report["average"]["json_decode"] == 20.0
+
+    path = tmp_path / "profile.json"
+    profiler.write_profile(str(path), report)
+    assert json.loads(path.read_text())["average"]["total"] == 20.0
+
+
+def test_failed_cycle_is_recorded():
+    prof = profiler.RefreshProfiler(1, clock=FakeClock())
+    prof.start_cycle()
+    prof.end_cycle(success=False)
+    assert prof.results[0]["success"] is False
+    assert prof.done
+
+
+def test_block_monitor_uses_given_task_factory():
+    async def run():
+        created = []
+
+        def create_task(coro):
+            task = asyncio.get_running_loop().create_task(coro)
+            created.append(task)
+            return task
+
+        prof = profiler.RefreshProfiler(1, block_threshold=0.01)
+        prof.start_block_monitor(create_task)
+        prof.start_block_monitor(create_task)
+        await asyncio.sleep(0)
+        # Busy wait, Home Assistant (loaded by other tests) rejects time.sleep
+        # inside the event loop
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+        await asyncio.sleep(profiler.BLOCK_CHECK_INTERVAL)
+        prof.stop_block_monitor()
+        return created, prof.blocks
+
+    created, blocks = asyncio.run(run())
+    assert len(created) == 1
+    assert created[0].cancelled() or created[0].done()
+    assert blocks and blocks[0]["stage"] == "outside refresh"
@@ -0,0 +1,86 @@
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "scheduler.py"
+)
+spec = importlib.util.spec_from_file_location("scheduler", MODULE_PATH)
+scheduler = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = scheduler
+spec.loader.exec_module(scheduler)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    clock = FakeClock()
+    bucket = scheduler.TokenBucket(rate=2.0, capacity=2, clock=clock)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_seconds_until_slot_keeps_period():
+    assert scheduler.seconds_until_slot(0.0, 30.0, 10.0) == 10.0 + 30.0
+    assert scheduler.seconds_until_slot(5.0, 30.0, 20.0) == 15.0
+    assert scheduler.seconds_until_slot(0.0, 30.0, 20.0) == 20.0
+
+
+def test_entries_are_evenly_staggered():
+    requests = scheduler.RequestScheduler(rate=1.0, burst=1, clock=FakeClock())
+    for entry_id in ("a", "b", "c"):
+        requests.register(entry_id)
+    assert [requests.phase(e, 30.0) for e in ("a", "b", "c")] == [0.0, 10.0, 20.0]
+
+    requests.unregister("b")
+    assert requests.phase("c", 30.0) == 15.0
+    assert list(requests.as_dict()["entries"]) == ["a", "c"]
+
+
+def test_rate_follows_demand_unless_capped():
+    requests = scheduler.RequestScheduler(rate=2.0, burst=5, clock=FakeClock())
+    requests.register("a")
+    requests.set_demand("a", 0.5)
+    assert requests.as_dict()["rate"] == 2.0
+
+    # 1000 stations polled every 30 s
+    requests.set_demand("a", 1000 / 30)
+    assert requests.as_dict()["rate"] == 1000 / 30 * scheduler.DEMAND_HEADROOM
+    assert requests.as_dict()["burst"] == 50
+
+    requests.register("b", limit=10.0)
+    assert requests.as_dict()["rate"] == 10.0
+    requests.unregister("b")
+    assert requests.as_dict()["rate"] == 1000 / 30 * scheduler.DEMAND_HEADROOM
+
+
+def test_waiters_sleep_concurrently(monkeypatch):
+    requests = scheduler.RequestScheduler(rate=1.0, burst=1, clock=FakeClock())
+    requests.register("a")
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def run():
+        await asyncio.gather(*(requests.async_acquire("a") for _ in range(3)))
+
+    monkeypatch.setattr(scheduler.asyncio, "sleep", fake_sleep)
+    asyncio.run(run())
+    # Each caller reserved its own slot, none waits for another's sleep
+    assert sleeps == [1.0, 2.0]
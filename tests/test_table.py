@@ -0,0 +1,69 @@
+import importlib.util
+from pathlib import Path
+
+PACKAGE_PATH = Path(__file__).resolve().parents[1] / "custom_components" / "solarcore_energy"
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(name, PACKAGE_PATH / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+table_module = load("table")
+parse_value = load("util").parse_value
+
+
+def make_table(capacity=2):
+    return table_module.StationTable(["power1", "temp"], parse_value, capacity)
+
+
+def test_write_reports_changes_and_parses_numbers():
+    table = make_table()
+    assert table.write(1, {"power1": "0.5kW", "status": "0"}) == {
+        "power1": (None, 500.0),
+        "status": (None, "0"),
+    }
+    assert table.write(1, {"power1": "500W", "status": "0"}) == {}
+    assert table.write(1, {"power1": "600W"}) == {
+        "power1": (500.0, 600.0),
+        "status": ("0", None),
+    }
+    assert dict(table[1]) == {"power1": 600.0}
+
+
+def test_rows_behave_like_mappings():
+    table = make_table()
+    table.write(1, {"power1": "100W"})
+    assert table.get(2, {}) == {}
+    assert table.get(1, {}).get("temp") is None
+    assert "power1" in table[1]
+    assert table.value(1, "power1") == 100.0
+    assert table.value(2, "power1") is None
+
+
+def test_grows_and_retains_stations():
+    table = make_table(capacity=1)
+    for station_id in range(5):
+        table.write(station_id, {"power1": station_id, "status": str(station_id)})
+    assert len(table) == 5
+
+    table.retain([1, 3])
+    assert list(table) == [1, 3]
+    assert dict(table[3]) == {"power1": 3.0, "status": "3"}
+    table.write(7, {"power1": 7})
+    assert table.value(7, "power1") == 7.0
+    assert table.value(1, "status") == "1"
+
+
+def test_copy_is_independent():
+    table = make_table()
+    table.write(1, {"power1": "500W", "status": "0"})
+    copied = table.copy()
+    table.write(1, {"power1": "600W", "status": "1"})
+    table.write(2, {"temp": "30"})
+
+    assert dict(copied[1]) == {"power1": 500.0, "status": "0"}
+    assert 2 not in copied
+    assert table.value(1, "power1") == 600.0
@@ -0,0 +1,48 @@
+import importlib.util
+from pathlib import Path
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "tiers.py"
+)
+spec = importlib.util.spec_from_file_location("tiers", MODULE_PATH)
+tiers = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(tiers)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_schedule(clock):
+    return tiers.TierSchedule(
+        {tiers.TIER_STATION_INFO: 300, tiers.TIER_STATION_LIST: 3600}, clock
+    )
+
+
+def test_everything_due_before_first_fetch():
+    schedule = make_schedule(FakeClock())
+    assert schedule.due_tiers() == {tiers.TIER_STATION_INFO, tiers.TIER_STATION_LIST}
+
+
+def test_tiers_become_due_after_their_period():
+    clock = FakeClock()
+    schedule = make_schedule(clock)
+    schedule.mark(schedule.due_tiers())
+
+    clock.now = 30
+    assert schedule.due_tiers() == set()
+    clock.now = 300
+    assert schedule.due_tiers() == {tiers.TIER_STATION_INFO}
+
+    schedule.mark({tiers.TIER_STATION_INFO})
+    clock.now = 500
+    assert schedule.due_tiers() == set()
+    clock.now = 3600
+    assert schedule.due_tiers() == {tiers.TIER_STATION_INFO, tiers.TIER_STATION_LIST}
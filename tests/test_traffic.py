@@ -0,0 +1,171 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "custom_components"
+    / "solarcore_energy"
+    / "traffic.py"
+)
+spec = importlib.util.spec_from_file_location("traffic", MODULE_PATH)
+traffic = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(traffic)
+
+RECORDS = [
+    {
+        "cycle": 1,
+        "t": 0.0,
+        "url": "/client/login",
+        "json": {"loginType": "1", "loginName": traffic.REDACTED},
+        "status": 200,
+        "duration": 0.1,
+        "response": {"data": {"token": traffic.REDACTED}},
+    },
+    {
+        "cycle": 1,
+        "t": 0.2,
+        "url": "/inverter",
+        "json": {"stationId": 2},
+        "status": 200,
+        "duration": 0.1,
+        "response": {"data": [{"power1": "20W"}]},
+    },
+    {
+        "cycle": 1,
+        "t": 0.3,
+        "url": "/inverter",
+        "json": {"stationId": 1},
+        "status": 500,
+        "duration": 0.1,
+    },
+]
+
+
+def test_redact_credentials_and_tokens():
+    assert traffic.redact(
+        {"loginName": "me", "password": "secret", "data": [{"token": "abc", "id": 1}]}
+    ) == {
+        "loginName": traffic.REDACTED,
+        "password": traffic.REDACTED,
+        "data": [{"token": traffic.REDACTED, "id": 1}],
+    }
+
+
+def test_trace_round_trip(tmp_path):
+    path = str(tmp_path / "traces" / "entry.jsonl.gz")
+    traffic.write_trace(path, RECORDS[:1])
+    traffic.write_trace(path, RECORDS[1:])
+    assert traffic.load_trace(path) == RECORDS
+
+
+def test_replay_matches_station_requests():
+    async def replay():
+        session = traffic.ReplaySession(RECORDS, speed=0)
+        session.start_cycle(1)
+        async with session.post("/inverter", json={"stationId": 2}) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+        async with session.post("/inverter", json={"stationId": 1}) as resp:
+            with pytest.raises(traffic.aiohttp.ClientResponseError):
+                resp.raise_for_status()
+        return data
+
+    assert asyncio.run(replay()) == {"data": [{"power1": "20W"}]}
+
+
+def test_recorder_keeps_cycle_details():
+    recorder = traffic.TrafficRecorder(session=None)
+    recorder.note_cycle(due=["station_info"])
+    recorder.start_cycle()
+    recorder.note_cycle(due=["station_info"], login=True)
+    assert recorder.take_records() == [
+        {
+            "cycle": 1,
+            "type": traffic.CYCLE_RECORD,
+            "t": pytest.approx(0, abs=1),
+            "due": ["station_info"],
+            "login": True,
+        }
+    ]
+
+
+def test_replay_session_splits_cycle_records():
+    info = {"cycle": 1, "type": traffic.CYCLE_RECORD, "t": 5.0, "login": True}
+    session = traffic.ReplaySession(
+        [info, *RECORDS, {**RECORDS[1], "cycle": 2, "t": 9.0}], speed=0
+    )
+    assert session.cycle_info == {1: info}
+    assert session.cycle_numbers == [1, 2]
+    assert session.cycle_start(1) == 5.0
+    assert session.cycle_start(2) == 9.0
+    assert len(session.cycles[1]) == len(RECORDS)
+
+
+class _Tiers:
+    periods = {"station_info": 300}
+
+    def __init__(self):
+        self.marked = []
+
+    def due_tiers(self):
+        return {"station_info"}
+
+    def mark(self, tiers):
+        self.marked.append(tiers)
+
+
+def test_replay_tiers_follow_recording():
+    real = _Tiers()
+    tiers = traffic.ReplayTiers(real)
+    tiers.start_cycle([])
+    assert tiers.due_tiers() == set()
+    tiers.start_cycle(None)
+    assert tiers.due_tiers() == {"station_info"}
+    tiers.mark({"station_info"})
+    assert real.marked == [{"station_info"}]
+
+
+def test_replay_tokens_follow_recorded_logins():
+    tokens = traffic.ReplayTokens()
+    # Recorded without a login, the token came from before the trace
+    tokens.start_cycle(False)
+    assert tokens.valid(0)
+    assert tokens.token == traffic.REDACTED
+    tokens.start_cycle(True)
+    assert not tokens.valid(0)
+    tokens.set("new", 0)
+    tokens.start_cycle(None)
+    assert tokens.valid(0)
+    tokens.reject(0)
+    assert not tokens.valid(0)
+
+
+def test_trace_stops_growing_at_size_cap(tmp_path):
+    path = str(tmp_path / "entry.jsonl.gz")
+    assert traffic.write_trace(path, RECORDS, max_bytes=1)
+    assert not traffic.write_trace(path, RECORDS, max_bytes=1)
+    assert traffic.load_trace(path) == RECORDS
+
+
+def test_concurrent_cycles_keep_their_records():
+    recorder = traffic.TrafficRecorder(session=None)
+
+    async def cycle(station_id):
+        recorder.start_cycle()
+        # Let the other cycle start before adding details to this one
+        await asyncio.sleep(0)
+        recorder.note_cycle(station=station_id)
+
+    async def main():
+        await asyncio.gather(cycle(1), cycle(2))
+
+    asyncio.run(main())
+    assert [(r["cycle"], r["station"]) for r in recorder.take_records()] == [
+        (1, 1),
+        (2, 2),
+    ]
@@ -27,3 +27,11 @@ def test_parse_temperature():
 
 def test_parse_invalid():
     assert parse_value("N/A") is None
+
+
+def test_energy_jump_limit_scales_with_elapsed_time():
+    assert util.max_energy_jump(0) == util.MAX_ENERGY_JUMP_KWH
+    assert util.max_energy_jump(30) == util.MAX_ENERGY_JUMP_KWH
+    # A 100 kW station gains about 8.3 kWh over the default 300 s info tier
+    assert util.max_energy_jump(300) == 50.0
+    assert 100 * 300 / 3600 < util.max_energy_jump(300)